@@ -0,0 +1,326 @@
+"""Load test for the API, driven in-process through an ASGI client.
+
+Seeds users, cycles, goals and reflections, then replays requests against
+the FastAPI ``app`` and reports throughput and p50/p95/p99 latency per
+endpoint. Every run is written to a JSON file named after the current commit
+so two runs can be compared:
+
+    python benchmarks/load.py --users 50 --concurrency 16
+    python benchmarks/load.py --compare benchmarks/results/load-1a2b3c4.json
+
+By default the database is mongomock-motor, which needs no server but runs
+every query in Python; absolute numbers are only meaningful against a real
+mongod (``--mongod``, using MONGO_URL and DB_NAME). mongomock does not
+support $lookup sub-pipelines, so cycle analytics is only run against mongod
+and is reported as skipped otherwise. Any other failed request is counted as
+an error rather than timed.
+
+The benchmark needs the development requirements:
+
+    pip install -r requirements-dev.txt
+
+With --mongod the benchmark collections in DB_NAME are dropped before
+seeding, so DB_NAME must contain "bench" unless --force is given.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from math import ceil
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'manifest12_bench')
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret')
+# Every simulated client shares one address; measure the endpoints, not the limiter
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+SEEDED_COLLECTIONS = ("users", "cycles", "goals", "reflections", "goal_progress_history", "dashboard_stats", "refresh_tokens")
+PASSWORD = "benchmark-password"
+
+
+class Account(NamedTuple):
+    email: str
+    token: str
+    cycle_ids: List[str]
+    goal_ids: List[str]
+
+
+class Endpoint(NamedTuple):
+    name: str
+    requests: int
+    # (client, account, rng) -> awaitable response
+    call: Callable
+    # Relies on queries mongomock cannot run
+    mongod_only: bool = False
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongod", action="store_true", help="use MONGO_URL/DB_NAME instead of mongomock-motor")
+    parser.add_argument("--force", action="store_true", help="allow --mongod against a DB_NAME without 'bench'")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=3, help="cycles per user")
+    parser.add_argument("--goals", type=int, default=5, help="goals per cycle")
+    parser.add_argument("--reflections", type=int, default=8, help="weekly reflections per cycle")
+    parser.add_argument("--requests", type=int, default=300, help="requests per endpoint")
+    parser.add_argument("--login-requests", type=int, default=30, help="login requests (bcrypt bound)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=12)
+    parser.add_argument("--output", type=Path, help="results file (default: results/load-<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    return parser.parse_args()
+
+
+def configure_backend(args):
+    import database
+
+    if args.mongod:
+        if "bench" not in os.environ['DB_NAME'] and not args.force:
+            sys.exit(f"Refusing to drop collections in {os.environ['DB_NAME']!r}; use a *bench* database or --force")
+        return database.get_database()
+
+    from mongomock_motor import AsyncMongoMockClient
+
+    mock = AsyncMongoMockClient()[os.environ['DB_NAME']]
+    database.configure_database(mock)
+    return mock
+
+
+async def seed(raw_db, args, rng: random.Random) -> List[Account]:
+    import dashboard_stats
+    from cycle_schedule import DERIVED_FIELDS
+    from indexes import ensure_indexes
+    from server import Cycle, Goal, Milestone, User, WeeklyReflection, access_token_claims, create_access_token, get_password_hash
+
+    for name in SEEDED_COLLECTIONS:
+        await raw_db[name].drop()
+    await ensure_indexes(raw_db)
+
+    # One bcrypt hash shared by every user keeps seeding fast without changing login cost
+    password_hash = get_password_hash(PASSWORD)
+    now = datetime.utcnow()
+    accounts = []
+    users, cycles, goals, reflections = [], [], [], []
+    for u in range(args.users):
+        user = User(email=f"bench{u}@example.com", full_name=f"Bench User {u}")
+        users.append(dict(user.dict(), password_hash=password_hash))
+        cycle_ids, goal_ids = [], []
+        for c in range(args.cycles):
+            start = now - timedelta(weeks=12 * (args.cycles - c - 1) + rng.randint(0, 11))
+            cycle = Cycle(
+                user_id=user.id,
+                title=f"Cycle {c}",
+                description="Twelve focused weeks",
+                start_date=start,
+                end_date=start + timedelta(weeks=12),
+                status="active" if c == args.cycles - 1 else "completed",
+                law_of_attraction_statement="I am already living the life I chose",
+            )
+            cycles.append(cycle.dict(exclude=DERIVED_FIELDS))
+            cycle_ids.append(cycle.id)
+            for g in range(args.goals):
+                progress = rng.randint(0, 100)
+                goal = Goal(
+                    cycle_id=cycle.id,
+                    user_id=user.id,
+                    title=f"Goal {g}",
+                    description="Measurable outcome for the cycle",
+                    category=rng.choice(["health", "career", "relationships", "finance"]),
+                    progress=progress,
+                    status="completed" if progress == 100 else "in_progress" if progress else "not_started",
+                    why_statement="Because it matters to me",
+                    visualization_note="I see it done",
+                    milestones=[Milestone(title=f"Milestone {m}", completed=rng.random() < 0.5) for m in range(3)],
+                )
+                goals.append(goal.dict())
+                goal_ids.append(goal.id)
+            for week in range(1, args.reflections + 1):
+                reflection = WeeklyReflection(
+                    cycle_id=cycle.id,
+                    user_id=user.id,
+                    week_number=week,
+                    week_start_date=start + timedelta(weeks=week - 1),
+                    progress_review="Steady progress",
+                    law_of_attraction_manifestations=[f"Manifestation {week}.{i}" for i in range(3)],
+                    neville_goddard_practice="Evening visualisation",
+                    challenges="Time",
+                    insights="Consistency beats intensity",
+                    next_week_focus=["Focus"],
+                    mood_rating=rng.randint(1, 10),
+                )
+                reflections.append(reflection.dict())
+        accounts.append(Account(user.email, create_access_token(access_token_claims(user.dict())), cycle_ids, goal_ids))
+
+    for name, docs in (("users", users), ("cycles", cycles), ("goals", goals), ("reflections", reflections)):
+        if docs:
+            await raw_db[name].insert_many(docs)
+    for user in users:
+        await dashboard_stats.rebuild_dashboard_stats(raw_db, user["id"])
+    return accounts
+
+
+def endpoints(args) -> List[Endpoint]:
+    def auth(account):
+        return {"Authorization": f"Bearer {account.token}"}
+
+    def login(client, account, rng):
+        return client.post("/api/auth/login", json={"email": account.email, "password": PASSWORD})
+
+    def dashboard(client, account, rng):
+        return client.get("/api/analytics/dashboard", headers=auth(account))
+
+    def cycle_analytics(client, account, rng):
+        return client.get(f"/api/cycles/{rng.choice(account.cycle_ids)}/analytics", headers=auth(account))
+
+    def goal_progress(client, account, rng):
+        return client.post(
+            f"/api/goals/{rng.choice(account.goal_ids)}/progress",
+            headers=auth(account),
+            json={"progress": rng.randint(0, 100), "notes": "benchmark"},
+        )
+
+    return [
+        Endpoint("login", args.login_requests, login),
+        Endpoint("dashboard", args.requests, dashboard),
+        Endpoint("cycle_analytics", args.requests, cycle_analytics, mongod_only=True),
+        Endpoint("goal_progress", args.requests, goal_progress),
+    ]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(ceil(pct / 100 * len(sorted_values)) - 1, 0)]
+
+
+async def run_endpoint(client, endpoint: Endpoint, accounts: List[Account], concurrency: int, rng: random.Random) -> dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    remaining = iter(range(endpoint.requests))
+
+    async def worker():
+        for _ in remaining:
+            account = rng.choice(accounts)
+            started = time.perf_counter()
+            response = await endpoint.call(client, account, rng)
+            elapsed = time.perf_counter() - started
+            if response.status_code < 400:
+                latencies.append(elapsed)
+            else:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+
+    # One untimed request per endpoint to warm caches and code paths
+    await endpoint.call(client, accounts[0], rng)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    ms = [value * 1000 for value in latencies]
+    return {
+        "requests": endpoint.requests,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "mean_ms": round(sum(ms) / len(ms), 2) if ms else 0.0,
+        "max_ms": round(ms[-1], 2) if ms else 0.0,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_results(results: dict, baseline: dict = None):
+    header = f"{'endpoint':<16} {'ok':>5} {'err':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    if baseline:
+        header += f" {'p95 vs base':>12} {'req/s vs base':>14}"
+    print(header)
+    for name, stats in results["endpoints"].items():
+        if "skipped" in stats:
+            print(f"{name:<16} skipped: {stats['skipped']}")
+            continue
+        errors = sum(stats["errors"].values())
+        line = (
+            f"{name:<16} {stats['requests'] - errors:>5} {errors:>5} {stats['throughput_rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+        )
+        before = (baseline or {}).get("endpoints", {}).get(name)
+        if before and before.get("p95_ms") and before.get("throughput_rps"):
+            line += f" {stats['p95_ms'] / before['p95_ms'] - 1:>+12.0%} {stats['throughput_rps'] / before['throughput_rps'] - 1:>+14.0%}"
+        print(line)
+
+
+async def run(args) -> dict:
+    import httpx
+
+    raw_db = configure_backend(args)
+    rng = random.Random(args.seed)
+    accounts = await seed(raw_db, args, rng)
+
+    import jobs
+    from server import app
+
+    # ASGITransport sends no lifespan events; start the job workers as the API's startup hook does
+    jobs.runner.start()
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for endpoint in endpoints(args):
+            if endpoint.mongod_only and not args.mongod:
+                results[endpoint.name] = {"skipped": "needs --mongod"}
+                continue
+            results[endpoint.name] = await run_endpoint(client, endpoint, accounts, args.concurrency, rng)
+    await jobs.runner.drain()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "backend": "mongod" if args.mongod else "mongomock",
+        "scale": {
+            "users": args.users,
+            "cycles_per_user": args.cycles,
+            "goals_per_cycle": args.goals,
+            "reflections_per_cycle": args.reflections,
+        },
+        "concurrency": args.concurrency,
+        "endpoints": results,
+    }
+
+
+def main():
+    args = parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = asyncio.run(run(args))
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_results(results, baseline)
+
+    output = args.output or RESULTS_DIR / f"load-{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Micro-benchmark for the list endpoint serialisation paths.
+
+Compares what a list endpoint costs per request once the documents are loaded:
+
+* validated: build Pydantic models, let FastAPI re-validate them against the
+  response model and encode with the stdlib ``json`` module (the default path)
+* fast: project trusted documents onto the model fields and encode with orjson
+  (the FAST_JSON path)
+
+    python benchmarks/serialization.py --sizes 10 100 500
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'manifest12_bench')
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret')
+
+import orjson  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from server import Goal, trusted_dump  # noqa: E402
+
+
+def make_goal_documents(count: int) -> List[dict]:
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": uuid.uuid4().hex[:24],
+            "id": str(uuid.uuid4()),
+            "cycle_id": str(uuid.uuid4()),
+            "user_id": "benchmark-user",
+            "title": f"Goal {i}",
+            "description": "Run three times a week and track every session",
+            "category": "health",
+            "start_week": 1,
+            "target_week": 12,
+            "progress": i % 101,
+            "status": "in_progress",
+            "why_statement": "Because I feel strong and energised every day",
+            "visualization_note": "I see myself crossing the finish line",
+            "milestones": [
+                {"id": str(uuid.uuid4()), "title": f"Milestone {m}", "completed": m % 2 == 0, "completed_date": None}
+                for m in range(3)
+            ],
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def validated_path(adapter: TypeAdapter, docs: List[dict]) -> bytes:
+    models = [Goal(**doc) for doc in docs]
+    validated = adapter.validate_python(models, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+
+def fast_path(docs: List[dict]) -> bytes:
+    return orjson.dumps([trusted_dump(Goal, doc) for doc in docs])
+
+
+def measure(func, *args, repeat: int) -> float:
+    func(*args)  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(List[Goal])
+    print(f"{'docs':>6} {'validated (us)':>15} {'fast (us)':>10} {'saved':>7}")
+    for size in args.sizes:
+        docs = make_goal_documents(size)
+        validated = measure(validated_path, adapter, docs, repeat=args.repeat)
+        fast = measure(fast_path, docs, repeat=args.repeat)
+        print(f"{size:>6} {validated * 1e6:>15.1f} {fast * 1e6:>10.1f} {1 - fast / validated:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
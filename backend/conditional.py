@@ -0,0 +1,67 @@
+"""Conditional GET support for the per-user read endpoints.
+
+Every user document carries a ``data_version`` counter that the write paths
+bump after changing any of the user's cycles, goals or reflections. A weak
+ETag is derived from that counter, the request path and query string, and the
+current UTC date (some fields are derived from today's date at read time).
+A request whose If-None-Match matches gets a 304 before any list query or
+serialisation runs; checking costs a single indexed read of the counter.
+
+Responses carry ``Cache-Control: private, no-cache`` so shared caches never
+store them and browsers always revalidate before reusing them.
+"""
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+DATA_VERSION_FIELD = "data_version"
+CACHE_CONTROL = "private, no-cache"
+
+
+async def load_data_version(db, user_id: str) -> int:
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, DATA_VERSION_FIELD: 1})
+    return (user or {}).get(DATA_VERSION_FIELD, 0)
+
+
+async def bump_data_version(db, user_id: str):
+    """Call after every write that changes what a user's read endpoints return"""
+    await db.users.update_one({"id": user_id}, {"$inc": {DATA_VERSION_FIELD: 1}})
+
+
+def weak_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag``"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+
+
+async def not_modified(db, request: Request, response: Response, user_id: str) -> Optional[Response]:
+    """Return a 304 response if the client's copy is current; otherwise set the
+    validator headers on ``response`` and return None"""
+    version = await load_data_version(db, user_id)
+    etag = weak_etag(user_id, version, request.url.path, request.url.query, datetime.utcnow().date())
+    headers = cache_headers(etag)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,140 @@
+"""Cycle calendar derived from ``start_date``/``end_date``.
+
+``current_week``, ``days_remaining`` and the twelve-week calendar are computed
+whenever a cycle is returned instead of being written by clients, so they
+advance with the clock. annotate_cycles() fills them in for a whole batch
+against a single "now"; stored values of these fields are ignored.
+
+Week and day counts are taken from UTC calendar dates, so they only change
+at UTC midnight. The list ETags (conditional.py) include the UTC date for
+the same reason, so a client never revalidates to stale counts.
+
+Active cycles whose end date has passed are moved to "completed" by
+complete_overdue_cycles(). The API runs it every CYCLE_ROLLOVER_INTERVAL_SECONDS
+from its startup hook; deployments without a long-lived process (Lambda) can
+run this module from a scheduler instead:
+
+    python cycle_schedule.py
+"""
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import dashboard_stats
+from timeutils import as_naive_utc
+
+CYCLE_WEEKS = 12
+CYCLE_ROLLOVER_INTERVAL_SECONDS = float(os.environ.get('CYCLE_ROLLOVER_INTERVAL_SECONDS', '3600'))
+CYCLE_ROLLOVER_BATCH_SIZE = int(os.environ.get('CYCLE_ROLLOVER_BATCH_SIZE', '500'))
+
+WEEK = timedelta(weeks=1)
+# Read-time fields; never written to the cycles collection
+DERIVED_FIELDS = {"current_week", "days_remaining", "weeks"}
+
+WEEK_OFFSETS = [(number, WEEK * (number - 1), WEEK * number) for number in range(1, CYCLE_WEEKS + 1)]
+
+
+def week_calendar(start_date: datetime) -> List[dict]:
+    return [
+        {"week_number": number, "start_date": start_date + begin, "end_date": start_date + end}
+        for number, begin, end in WEEK_OFFSETS
+    ]
+
+
+def annotate_cycles(cycles: List[dict], now: Optional[datetime] = None) -> List[dict]:
+    """Set current_week, days_remaining and weeks on each cycle document in place"""
+    today = (now or datetime.utcnow()).date()
+    for cycle in cycles:
+        # A cycle not yet round-tripped through MongoDB may still carry the client's offset
+        start_day, end_day = as_naive_utc(cycle["start_date"]).date(), as_naive_utc(cycle["end_date"]).date()
+        if cycle.get("status") == "completed":
+            cycle["current_week"] = CYCLE_WEEKS
+            cycle["days_remaining"] = 0
+        else:
+            elapsed_days = (min(today, end_day) - start_day).days
+            cycle["current_week"] = min(max(elapsed_days // 7 + 1, 1), CYCLE_WEEKS)
+            cycle["days_remaining"] = max((end_day - today).days, 0)
+        cycle["weeks"] = week_calendar(cycle["start_date"])
+    return cycles
+
+
+def annotate_cycle(cycle: dict, now: Optional[datetime] = None) -> dict:
+    return annotate_cycles([cycle], now)[0]
+
+
+def weeks_completed(cycle: dict) -> int:
+    """Whole weeks behind an annotated cycle"""
+    if cycle.get("status") == "completed":
+        return CYCLE_WEEKS
+    return cycle["current_week"] - 1
+
+
+async def complete_overdue_cycles(
+    db,
+    on_completed: Optional[Callable[[str, List[dict]], Awaitable[None]]] = None,
+    now: Optional[datetime] = None,
+    batch_size: int = CYCLE_ROLLOVER_BATCH_SIZE,
+) -> int:
+    """Complete every active cycle whose end_date has passed, ``batch_size`` at a time.
+
+    Each batch is one read and one update_many. A cycle completed by its owner
+    between the two is left alone: completed_at doubles as a marker of which
+    documents this batch actually changed. Dashboard stats are adjusted per
+    user, then ``on_completed(user_id, cycles)`` is awaited with the updated
+    documents. Returns the number of cycles completed."""
+    # MongoDB keeps millisecond precision, so the marker must too
+    now = now or datetime.utcnow()
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    update = {"status": "completed", "completed_at": now, "updated_at": now}
+    completed = 0
+    while True:
+        overdue = await db.cycles.find(
+            {"status": "active", "end_date": {"$lte": now}}, {"_id": 0}
+        ).sort("end_date", 1).limit(batch_size).to_list(batch_size)
+        if not overdue:
+            return completed
+        ids = [cycle["id"] for cycle in overdue]
+        result = await db.cycles.update_many({"id": {"$in": ids}, "status": "active"}, {"$set": update})
+        if result.modified_count < len(overdue):
+            changed = {
+                cycle["id"] async for cycle in db.cycles.find({"id": {"$in": ids}, "completed_at": now}, {"_id": 0, "id": 1})
+            }
+            overdue = [cycle for cycle in overdue if cycle["id"] in changed]
+
+        by_user: Dict[str, List[dict]] = defaultdict(list)
+        for cycle in overdue:
+            by_user[cycle["user_id"]].append({**cycle, **update})
+        for user_id, cycles in by_user.items():
+            await dashboard_stats.record_cycle_status_changes(db, user_id, [("active", "completed")] * len(cycles))
+            if on_completed:
+                await on_completed(user_id, cycles)
+        completed += len(overdue)
+        if len(ids) < batch_size:
+            return completed
+
+
+async def _main():
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from conditional import bump_data_version
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+
+    async def on_completed(user_id: str, cycles: List[dict]):
+        await bump_data_version(db, user_id)
+
+    try:
+        completed = await complete_overdue_cycles(db, on_completed)
+        print(f"Completed {completed} overdue cycle(s)")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,187 @@
+"""Incrementally maintained per-user dashboard aggregates.
+
+Each user has one ``dashboard_stats`` document holding cycle and goal counts
+by status plus their most recent reflections. Write paths keep it current with
+atomic ``$inc``/``$push`` updates so ``/analytics/dashboard`` is a single
+indexed read. Updates never upsert: a missing document is rebuilt from the
+source collections on the next read, which also makes rebuild the way to
+reconcile drift:
+
+    python dashboard_stats.py                  # rebuild every user
+    python dashboard_stats.py --user-id <id>   # rebuild one user
+"""
+import argparse
+import asyncio
+import os
+from datetime import datetime
+from pathlib import Path
+
+RECENT_REFLECTIONS_LIMIT = 10
+MANIFESTATIONS_PER_REFLECTION = 2
+
+# Statuses that get a counter; they become field names in the stats document, so
+# nothing outside these sets (empty, dotted or "$"-prefixed strings) may reach an update
+CYCLE_STATUSES = ("active", "completed", "paused", "archived")
+GOAL_STATUSES = ("not_started", "in_progress", "completed", "on_hold")
+STATUS_FIELDS = {"cycles_by_status": CYCLE_STATUSES, "goals_by_status": GOAL_STATUSES}
+
+
+def _recent_reflection_entry(reflection: dict) -> dict:
+    return {
+        "manifestations": reflection.get("law_of_attraction_manifestations", [])[:MANIFESTATIONS_PER_REFLECTION],
+        "mood_rating": reflection.get("mood_rating", 5),
+    }
+
+
+def _status_count(field: str, status: str, delta: int) -> dict:
+    return {f"{field}.{status}": delta} if status in STATUS_FIELDS[field] else {}
+
+
+def _status_change(field: str, old_status: str, new_status: str) -> dict:
+    return {**_status_count(field, old_status, -1), **_status_count(field, new_status, 1)}
+
+
+async def _apply(db, user_id: str, update: dict):
+    update.setdefault("$set", {})["updated_at"] = datetime.utcnow()
+    await db.dashboard_stats.update_one({"user_id": user_id}, update)
+
+
+async def record_cycle_created(db, user_id: str, status: str):
+    await _apply(db, user_id, {"$inc": {"total_cycles": 1, **_status_count("cycles_by_status", status, 1)}})
+
+
+async def record_cycle_status_change(db, user_id: str, old_status: str, new_status: str):
+    await record_cycle_status_changes(db, user_id, [(old_status, new_status)])
+
+
+async def record_cycle_status_changes(db, user_id: str, changes):
+    """Apply several (old_status, new_status) cycle transitions in one update"""
+    await _record_status_changes(db, user_id, "cycles_by_status", changes)
+
+
+async def record_goal_created(db, user_id: str, status: str):
+    await _apply(db, user_id, {"$inc": {"total_goals": 1, **_status_count("goals_by_status", status, 1)}})
+
+
+async def record_goal_status_change(db, user_id: str, old_status: str, new_status: str):
+    await record_goal_status_changes(db, user_id, [(old_status, new_status)])
+
+
+async def record_goal_status_changes(db, user_id: str, changes):
+    """Apply several (old_status, new_status) goal transitions in one update"""
+    await _record_status_changes(db, user_id, "goals_by_status", changes)
+
+
+async def _record_status_changes(db, user_id: str, field: str, changes):
+    increments = {}
+    for old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        for key, delta in _status_change(field, old_status, new_status).items():
+            increments[key] = increments.get(key, 0) + delta
+    increments = {key: delta for key, delta in increments.items() if delta}
+    if increments:
+        await _apply(db, user_id, {"$inc": increments})
+
+
+async def record_reflection_created(db, user_id: str, reflection: dict):
+    await _apply(db, user_id, {
+        "$push": {
+            "recent_reflections": {
+                "$each": [_recent_reflection_entry(reflection)],
+                "$position": 0,
+                "$slice": RECENT_REFLECTIONS_LIMIT,
+            }
+        }
+    })
+
+
+async def _count_by_status(collection, user_id: str, statuses) -> tuple:
+    """(total documents, counts for the known ``statuses``)"""
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+    ]
+    groups = await collection.aggregate(pipeline).to_list(None)
+    by_status = {group["_id"]: group["count"] for group in groups if group["_id"] in statuses}
+    return sum(group["count"] for group in groups), by_status
+
+
+async def rebuild_dashboard_stats(db, user_id: str) -> dict:
+    """Recompute a user's stats document from the source collections"""
+    total_cycles, cycles_by_status = await _count_by_status(db.cycles, user_id, CYCLE_STATUSES)
+    total_goals, goals_by_status = await _count_by_status(db.goals, user_id, GOAL_STATUSES)
+    reflections = await db.reflections.find(
+        {"user_id": user_id},
+        {"law_of_attraction_manifestations": 1, "mood_rating": 1, "_id": 0}
+    ).sort("created_at", -1).limit(RECENT_REFLECTIONS_LIMIT).to_list(RECENT_REFLECTIONS_LIMIT)
+
+    stats = {
+        "user_id": user_id,
+        "total_cycles": total_cycles,
+        "cycles_by_status": cycles_by_status,
+        "total_goals": total_goals,
+        "goals_by_status": goals_by_status,
+        "recent_reflections": [_recent_reflection_entry(reflection) for reflection in reflections],
+        "updated_at": datetime.utcnow(),
+    }
+    await db.dashboard_stats.replace_one({"user_id": user_id}, stats, upsert=True)
+    return stats
+
+
+async def load_dashboard_stats(db, user_id: str) -> dict:
+    stats = await db.dashboard_stats.find_one({"user_id": user_id}, {"_id": 0})
+    if stats is None:
+        stats = await rebuild_dashboard_stats(db, user_id)
+    return stats
+
+
+def dashboard_analytics_fields(stats: dict) -> dict:
+    """Map a stats document onto the DashboardAnalytics response fields"""
+    cycles_by_status = stats.get("cycles_by_status", {})
+    goals_by_status = stats.get("goals_by_status", {})
+    total_goals = stats.get("total_goals", 0)
+    completed_goals = goals_by_status.get("completed", 0)
+    recent_reflections = stats.get("recent_reflections", [])
+
+    # Recent manifestations from the last 5 reflections, up to 2 per reflection
+    recent_manifestations = []
+    for entry in recent_reflections[:5]:
+        recent_manifestations.extend(entry.get("manifestations", []))
+
+    return {
+        "total_cycles": stats.get("total_cycles", 0),
+        "active_cycles": cycles_by_status.get("active", 0),
+        "completed_cycles": cycles_by_status.get("completed", 0),
+        "total_goals": total_goals,
+        "completed_goals": completed_goals,
+        "average_completion_rate": (completed_goals / total_goals * 100) if total_goals > 0 else 0,
+        "recent_manifestations": recent_manifestations[:10],
+        "mood_trend": [entry.get("mood_rating", 5) for entry in recent_reflections][:10],
+    }
+
+
+async def _main(user_id: str = None):
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    try:
+        if user_id:
+            user_ids = [user_id]
+        else:
+            user_ids = [user["id"] async for user in db.users.find({}, {"id": 1, "_id": 0})]
+        for uid in user_ids:
+            await rebuild_dashboard_stats(db, uid)
+        print(f"Rebuilt dashboard stats for {len(user_ids)} user(s)")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild Manifest 12 dashboard aggregates")
+    parser.add_argument("--user-id", help="rebuild a single user instead of every user")
+    args = parser.parse_args()
+    asyncio.run(_main(args.user_id))
@@ -0,0 +1,106 @@
+"""MongoDB client lifecycle.
+
+One Motor client is created per process and reused by every request and, on
+serverless platforms, by every warm invocation. Nothing is imported or
+connected until get_database() is first called, so a lazily initialised
+process only pays for Motor when a request actually needs the database.
+
+Pool sizing, timeouts and wire compression come from the environment; any
+option left unset keeps the driver default:
+
+    MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_MAX_IDLE_TIME_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS, MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_CONNECT_TIMEOUT_MS, MONGO_COMPRESSORS (e.g. "zstd,snappy,zlib")
+
+zstd and snappy need the optional zstandard / python-snappy packages; the
+driver skips compressors whose library is missing. MONGO_METRICS=false turns
+off the pool and command listeners.
+
+Collections handed out by ``db`` are wrapped so request instrumentation can
+attribute time to MongoDB and the query profiler can see every operation;
+with REQUEST_METRICS=false and QUERY_PROFILING off the raw collections are
+handed out.
+"""
+import os
+
+from instrumentation import InstrumentedCollection
+from query_profiler import QUERY_PROFILING
+
+REQUEST_METRICS = os.environ.get('REQUEST_METRICS', 'true').lower() in ('1', 'true', 'yes')
+INSTRUMENT_COLLECTIONS = REQUEST_METRICS or QUERY_PROFILING
+
+_client = None
+_database = None
+
+CLIENT_OPTIONS = (
+    ('MONGO_MAX_POOL_SIZE', 'maxPoolSize', int),
+    ('MONGO_MIN_POOL_SIZE', 'minPoolSize', int),
+    ('MONGO_MAX_IDLE_TIME_MS', 'maxIdleTimeMS', int),
+    ('MONGO_WAIT_QUEUE_TIMEOUT_MS', 'waitQueueTimeoutMS', int),
+    ('MONGO_SERVER_SELECTION_TIMEOUT_MS', 'serverSelectionTimeoutMS', int),
+    ('MONGO_CONNECT_TIMEOUT_MS', 'connectTimeoutMS', int),
+    ('MONGO_COMPRESSORS', 'compressors', str),
+)
+
+
+def client_options() -> dict:
+    options = {}
+    for env_name, option, cast in CLIENT_OPTIONS:
+        value = os.environ.get(env_name)
+        if value:
+            options[option] = cast(value)
+    if os.environ.get('MONGO_METRICS', 'true').lower() in ('1', 'true', 'yes'):
+        from mongo_metrics import CommandMetricsListener, PoolMetricsListener
+
+        options['event_listeners'] = [PoolMetricsListener(), CommandMetricsListener()]
+    return options
+
+
+def get_client():
+    global _client
+    if _client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        _client = AsyncIOMotorClient(os.environ['MONGO_URL'], **client_options())
+    return _client
+
+
+def get_database():
+    global _database
+    if _database is None:
+        _database = get_client()[os.environ['DB_NAME']]
+    return _database
+
+
+def configure_database(database):
+    """Use an already constructed database handle instead of MONGO_URL/DB_NAME (benchmarks, tests)"""
+    global _database
+    _database = database
+
+
+def close_client():
+    global _client, _database
+    if _client is not None:
+        _client.close()
+        _client = None
+        _database = None
+
+
+def _collection(collection):
+    # Database methods such as command() pass through untouched
+    if INSTRUMENT_COLLECTIONS and hasattr(collection, "find_one"):
+        return InstrumentedCollection(collection)
+    return collection
+
+
+class LazyDatabase:
+    """Stand-in for the database handle that resolves it on first use"""
+
+    def __getattr__(self, name):
+        return _collection(getattr(get_database(), name))
+
+    def __getitem__(self, name):
+        return _collection(get_database()[name])
+
+
+db = LazyDatabase()
@@ -0,0 +1,137 @@
+"""Per-user push events served over Server-Sent Events at GET /api/events.
+
+Write paths publish small events ("goal.updated", "cycle.analytics", ...) to
+the broker, which fans them out to every open stream of the same user. Events
+are encoded once at publish time and connections only hold the encoded text.
+
+Memory per connection is bounded: each subscription has a queue of at most
+EVENT_QUEUE_SIZE messages, and a user may hold at most
+EVENT_MAX_CONNECTIONS_PER_USER streams. A consumer that falls behind
+has its queue replaced by a single "resync" event, telling the client to
+catch up through /api/sync.
+
+InProcessBroker only reaches streams served by the same process. A
+multi-process deployment can pass any object with the same four methods
+(for example one backed by Redis pub/sub) to configure_broker().
+"""
+import asyncio
+import json
+import os
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+from metrics import Counter, Gauge
+
+EVENT_QUEUE_SIZE = int(os.environ.get('EVENT_QUEUE_SIZE', '100'))
+EVENT_MAX_CONNECTIONS_PER_USER = int(os.environ.get('EVENT_MAX_CONNECTIONS_PER_USER', '10'))
+EVENT_HEARTBEAT_SECONDS = float(os.environ.get('EVENT_HEARTBEAT_SECONDS', '15'))
+
+# Fields carried by the "<kind>.<action>" events; clients fetch full documents through /api/sync
+EVENT_FIELDS = {
+    "cycle": ("status", "current_week", "updated_at"),
+    "goal": ("cycle_id", "progress", "status", "updated_at"),
+    "reflection": ("cycle_id", "week_number", "mood_rating", "created_at"),
+}
+
+event_connections = Gauge("event_stream_connections", "Open event streams")
+events_published = Counter("events_published_total", "Events published", ["type"])
+event_overflows = Counter("event_stream_overflows_total", "Event queues that overflowed and were reset to a resync")
+
+
+class TooManyConnections(Exception):
+    pass
+
+
+def encode_event(event_type: str, data: Any, event_id: Optional[str] = None) -> str:
+    """One SSE message; ``id`` here is the entity the event is about"""
+    payload = {"type": event_type, "data": data}
+    if event_id is not None:
+        payload["id"] = event_id
+    return f"event: {event_type}\ndata: {json.dumps(jsonable_encoder(payload), separators=(',', ':'))}\n\n"
+
+
+RESYNC_MESSAGE = encode_event("resync", None)
+HEARTBEAT_MESSAGE = ": keep-alive\n\n"
+
+
+class Subscription:
+    def __init__(self, user_id: str, maxsize: int = EVENT_QUEUE_SIZE):
+        self.user_id = user_id
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, message: str):
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            event_overflows.inc()
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC_MESSAGE)
+
+    async def next_message(self, timeout: float) -> Optional[str]:
+        """The next message, or None if nothing arrived within ``timeout``"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker:
+    def __init__(self, max_connections_per_user: int = EVENT_MAX_CONNECTIONS_PER_USER):
+        self.max_connections_per_user = max_connections_per_user
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscriptions = self._subscriptions[user_id]
+        if len(subscriptions) >= self.max_connections_per_user:
+            raise TooManyConnections(user_id)
+        subscription = Subscription(user_id)
+        subscriptions.add(subscription)
+        event_connections.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions and subscription in subscriptions:
+            subscriptions.discard(subscription)
+            event_connections.dec()
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def has_subscribers(self, user_id: str) -> bool:
+        return user_id in self._subscriptions
+
+    def publish(self, user_id: str, message: str):
+        for subscription in list(self._subscriptions.get(user_id, ())):
+            subscription.deliver(message)
+
+
+broker = InProcessBroker()
+
+
+def configure_broker(new_broker):
+    global broker
+    broker = new_broker
+
+
+def publish(user_id: str, event_type: str, data: Any, event_id: Optional[str] = None):
+    events_published.inc(type=event_type)
+    broker.publish(user_id, encode_event(event_type, data, event_id))
+
+
+def publish_change(user_id: str, kind: str, action: str, doc: dict):
+    data = {field: doc.get(field) for field in EVENT_FIELDS[kind]}
+    publish(user_id, f"{kind}.{action}", data, doc["id"])
+
+
+async def stream(subscription: Subscription):
+    """SSE body for one subscription; unsubscribes when the client goes away"""
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            message = await subscription.next_message(EVENT_HEARTBEAT_SECONDS)
+            yield message if message is not None else HEARTBEAT_MESSAGE
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,171 @@
+"""Index management for the Manifest 12 collections.
+
+Every index here mirrors a query shape issued by server.py. ensure_indexes is
+idempotent, so it is safe to run on every startup; run this module directly to
+apply the indexes or to explain the query shapes from a shell:
+
+    python indexes.py            # create missing indexes
+    python indexes.py --explain  # report query shapes that fall back to COLLSCAN
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from sync import TOMBSTONE_RETENTION_DAYS, TOMBSTONES
+
+logger = logging.getLogger(__name__)
+
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("id", ASCENDING)], unique=True),
+    ],
+    "cycles": [
+        IndexModel([("id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("updated_at", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("end_date", ASCENDING)]),
+    ],
+    "goals": [
+        IndexModel([("id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("cycle_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("updated_at", ASCENDING)]),
+    ],
+    "reflections": [
+        IndexModel([("id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("cycle_id", ASCENDING), ("week_number", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("week_number", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "status_checks": [
+        IndexModel([("timestamp", ASCENDING), ("id", ASCENDING)]),
+    ],
+    "goal_progress_history": [
+        IndexModel([("goal_id", ASCENDING), ("count", ASCENDING)]),
+        IndexModel([("goal_id", ASCENDING), ("first_date", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("written_at", ASCENDING)]),
+    ],
+    "refresh_tokens": [
+        IndexModel([("token_hash", ASCENDING)], unique=True),
+        IndexModel([("family_id", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING)]),
+        # TTL index: refresh tokens disappear once they expire
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    TOMBSTONES: [
+        IndexModel([("user_id", ASCENDING), ("deleted_at", ASCENDING)]),
+        # TTL index: tombstones only need to outlive the oldest sync token still honoured
+        IndexModel([("deleted_at", ASCENDING)], expireAfterSeconds=TOMBSTONE_RETENTION_DAYS * 86400),
+    ],
+    "dashboard_stats": [
+        IndexModel([("user_id", ASCENDING)], unique=True),
+    ],
+    "password_reset_tokens": [
+        IndexModel([("token", ASCENDING), ("used", ASCENDING), ("expires_at", ASCENDING)]),
+        # TTL index: MongoDB removes reset tokens as soon as they expire
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+}
+
+# Representative query shapes issued by server.py: (collection, filter, sort)
+QUERY_SHAPES = [
+    ("users", {"email": "user@example.com"}, None),
+    ("users", {"id": "user-id"}, None),
+    ("cycles", {"id": "cycle-id", "user_id": "user-id"}, None),
+    ("cycles", {"user_id": "user-id"}, [("created_at", ASCENDING), ("id", ASCENDING)]),
+    ("goals", {"id": "goal-id", "user_id": "user-id"}, None),
+    ("goals", {"user_id": "user-id"}, [("created_at", ASCENDING), ("id", ASCENDING)]),
+    ("goals", {"user_id": "user-id", "cycle_id": "cycle-id"}, [("created_at", ASCENDING), ("id", ASCENDING)]),
+    ("reflections", {"id": "reflection-id", "user_id": "user-id"}, None),
+    ("reflections", {"user_id": "user-id"}, [("week_number", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+    ("reflections", {"user_id": "user-id", "cycle_id": "cycle-id"}, [("week_number", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+    ("reflections", {"user_id": "user-id"}, [("created_at", DESCENDING)]),
+    ("cycles", {"user_id": "user-id", "updated_at": {"$gt": datetime(2000, 1, 1)}}, None),
+    ("cycles", {"status": "active", "end_date": {"$lte": datetime(2000, 1, 1)}}, [("end_date", ASCENDING)]),
+    ("goals", {"user_id": "user-id", "updated_at": {"$gt": datetime(2000, 1, 1)}}, None),
+    ("reflections", {"user_id": "user-id", "created_at": {"$gt": datetime(2000, 1, 1)}}, None),
+    ("status_checks", {}, [("timestamp", ASCENDING), ("id", ASCENDING)]),
+    ("goal_progress_history", {"goal_id": "goal-id", "count": {"$lt": 100}}, None),
+    ("goal_progress_history", {"goal_id": "goal-id"}, [("first_date", ASCENDING)]),
+    ("goal_progress_history", {"goal_id": {"$in": ["goal-id"]}, "snapshots.id": {"$in": ["snapshot-id"]}}, None),
+    ("goal_progress_history", {"user_id": "user-id", "written_at": {"$gt": datetime(2000, 1, 1)}}, None),
+    ("refresh_tokens", {"token_hash": "hash", "used_at": None, "expires_at": {"$gt": datetime(2000, 1, 1)}}, None),
+    ("refresh_tokens", {"family_id": "family-id"}, None),
+    ("refresh_tokens", {"user_id": "user-id"}, None),
+    (TOMBSTONES, {"user_id": "user-id", "deleted_at": {"$gt": datetime(2000, 1, 1)}}, None),
+    ("dashboard_stats", {"user_id": "user-id"}, None),
+    ("password_reset_tokens", {"token": "token", "used": False, "expires_at": {"$gt": datetime(2000, 1, 1)}}, None),
+]
+
+
+async def ensure_indexes(db):
+    """Create every declared index that does not exist yet; returns the names of all declared indexes"""
+    ensured = []
+    for collection_name, indexes in INDEXES.items():
+        for index in indexes:
+            try:
+                names = await db[collection_name].create_indexes([index])
+                ensured.extend(f"{collection_name}.{name}" for name in names)
+            except OperationFailure as exc:
+                # Usually a conflicting definition or duplicate keys; keep bootstrapping the rest
+                logger.error("Could not create index %s on %s: %s", index.document["name"], collection_name, exc)
+    return ensured
+
+
+def _plan_stages(plan):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+async def find_collection_scans(db):
+    """Explain every known query shape and return the ones whose winning plan is a COLLSCAN"""
+    scans = []
+    for collection_name, query_filter, sort in QUERY_SHAPES:
+        find = {"find": collection_name, "filter": query_filter}
+        if sort:
+            find["sort"] = dict(sort)
+        explain = await db.command({"explain": find, "verbosity": "queryPlanner"})
+        winning_plan = explain["queryPlanner"]["winningPlan"]
+        if "COLLSCAN" in set(_plan_stages(winning_plan)):
+            scans.append({"collection": collection_name, "filter": query_filter, "sort": sort})
+    return scans
+
+
+async def _main(explain: bool):
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    try:
+        ensured = await ensure_indexes(db)
+        print(f"Indexes ensured ({len(ensured)} declared)")
+        if explain:
+            scans = await find_collection_scans(db)
+            for scan in scans:
+                print(f"COLLSCAN: {scan['collection']} filter={scan['filter']} sort={scan['sort']}")
+            if not scans:
+                print("All query shapes are served by an index")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create Manifest 12 MongoDB indexes")
+    parser.add_argument("--explain", action="store_true", help="report query shapes that fall back to a collection scan")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.explain))
@@ -0,0 +1,243 @@
+"""Request-level latency instrumentation.
+
+RequestMetricsMiddleware is a pure ASGI middleware that records, per route
+template, request latency, response size and in-flight requests. Each request
+also gets a small timings dict in a context variable. The pieces of the app
+that know where time goes write into it:
+
+* get_current_user wraps itself in timed_phase("auth")
+* InstrumentedCollection adds the time spent awaiting MongoDB to "db"
+* TimedRoute marks when the endpoint returned; the gap until the response
+  starts is reported as "serialization"
+
+Whatever is left of the endpoint's own time is reported as "handler".
+
+The collection wrappers also hand each operation to the query profiler, which
+ignores it unless QUERY_PROFILING is on.
+"""
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.routing import APIRoute
+
+from metrics import Gauge, Histogram
+from query_profiler import documents_returned, is_active, record_query
+
+request_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+request_phase_seconds = Histogram(
+    "http_request_phase_seconds", "Time spent per request phase", ["route", "phase"]
+)
+response_size_bytes = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ["method", "route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+
+_request_timings: ContextVar[Optional[dict]] = ContextVar("request_timings", default=None)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@contextmanager
+def timed_phase(name: str):
+    """Attribute the wall time of the block, including any DB calls inside it, to ``name``"""
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    db_before = timings["db"]
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+        timings["db"] = db_before
+
+
+def record_db_time(seconds: float):
+    timings = _request_timings.get()
+    if timings is not None:
+        timings["db"] += seconds
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings = {"db": 0.0, "handler_started": None, "handler_ended": None, "response_started": None}
+        token = _request_timings.set(timings)
+        response = {"status": 500, "size": 0}
+        requests_in_flight.inc()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                timings["response_started"] = time.perf_counter()
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            requests_in_flight.dec()
+            _request_timings.reset(token)
+            self._observe(scope, started, timings, response)
+
+    @staticmethod
+    def _observe(scope, started: float, timings: dict, response: dict):
+        route = scope.get("route")
+        route_path = getattr(route, "path", UNMATCHED_ROUTE)
+        method = scope["method"]
+        request_seconds.observe(time.perf_counter() - started, method=method, route=route_path, status=response["status"])
+        response_size_bytes.observe(response["size"], method=method, route=route_path)
+
+        request_phase_seconds.observe(timings.get("auth", 0.0), route=route_path, phase="auth")
+        request_phase_seconds.observe(timings["db"], route=route_path, phase="db")
+        if timings["handler_started"] is not None and timings["handler_ended"] is not None:
+            handler = timings["handler_ended"] - timings["handler_started"] - timings.get("handler_db", 0.0)
+            request_phase_seconds.observe(max(handler, 0.0), route=route_path, phase="handler")
+            if timings["response_started"] is not None:
+                serialization = timings["response_started"] - timings["handler_ended"]
+                request_phase_seconds.observe(max(serialization, 0.0), route=route_path, phase="serialization")
+
+
+def _timed_endpoint(endpoint):
+    if not inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def timed(*args, **kwargs):
+        timings = _request_timings.get()
+        if timings is None:
+            return await endpoint(*args, **kwargs)
+        timings["handler_started"] = time.perf_counter()
+        db_before = timings["db"]
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings["handler_ended"] = time.perf_counter()
+            timings["handler_db"] = timings["db"] - db_before
+
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that marks when its endpoint starts and returns"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+
+class InstrumentedCursor:
+    """Wraps a Motor cursor so awaiting results counts as DB time"""
+
+    def __init__(self, cursor, collection: str, operation: str, spec):
+        self._cursor = cursor
+        self._query = (collection, operation, spec)
+        self._iter_seconds = 0.0
+        self._iter_returned = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._cursor, name)
+        if name == "to_list":
+            return _timed_call(attr, *self._query)
+        if callable(attr):
+            @functools.wraps(attr)
+            def chained(*args, **kwargs):
+                result = attr(*args, **kwargs)
+                return self if result is self._cursor else result
+            return chained
+        return attr
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        started = time.perf_counter()
+        try:
+            doc = await self._cursor.__anext__()
+        except StopAsyncIteration:
+            self._iter_seconds += time.perf_counter() - started
+            if is_active():
+                record_query(*self._query, self._iter_seconds, self._iter_returned)
+            raise
+        finally:
+            record_db_time(time.perf_counter() - started)
+        self._iter_seconds += time.perf_counter() - started
+        self._iter_returned += 1
+        return doc
+
+
+def _timed_call(method, collection: str, operation: str, spec):
+    @functools.wraps(method)
+    async def call(*args, **kwargs):
+        started = time.perf_counter()
+        result = None
+        try:
+            result = await method(*args, **kwargs)
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            record_db_time(elapsed)
+            # Outside a profiled request there is nothing to record the query into
+            if is_active():
+                record_query(collection, operation, spec, elapsed, documents_returned(result))
+    return call
+
+
+CURSOR_METHODS = frozenset({"find", "aggregate"})
+AWAITABLE_METHODS = frozenset({
+    "find_one", "find_one_and_update", "find_one_and_replace", "find_one_and_delete",
+    "insert_one", "insert_many", "update_one", "update_many", "replace_one",
+    "delete_one", "delete_many", "bulk_write", "count_documents", "distinct",
+})
+# Operations whose first argument is not a filter or pipeline
+UNFILTERED_METHODS = frozenset({"insert_one", "insert_many", "bulk_write"})
+
+
+def _query_spec(operation: str, args, kwargs):
+    if operation in UNFILTERED_METHODS:
+        return None
+    if operation == "distinct":
+        args = args[1:]
+    if args:
+        return args[0]
+    return kwargs.get("pipeline" if operation == "aggregate" else "filter")
+
+
+class InstrumentedCollection:
+    """Wraps a Motor collection so every awaited operation counts as DB time"""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name in AWAITABLE_METHODS:
+            @functools.wraps(attr)
+            def operation(*args, **kwargs):
+                spec = _query_spec(name, args, kwargs)
+                return _timed_call(attr, self._collection.name, name, spec)(*args, **kwargs)
+            return operation
+        if name in CURSOR_METHODS:
+            @functools.wraps(attr)
+            def cursor(*args, **kwargs):
+                spec = _query_spec(name, args, kwargs)
+                return InstrumentedCursor(attr(*args, **kwargs), self._collection.name, name, spec)
+            return cursor
+        return attr
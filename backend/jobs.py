@@ -0,0 +1,235 @@
+"""Background jobs for work that does not have to finish before the response.
+
+Handlers are registered by name and take keyword arguments a durable store
+could persist (strings, numbers, datetimes, lists and dicts of them):
+
+    @jobs.register("goal.progress_snapshots")
+    async def write_progress_snapshots(user_id, snapshots): ...
+
+    await jobs.enqueue("goal.progress_snapshots", user_id=..., snapshots=[...])
+
+The API starts JOB_WORKERS worker tasks on startup. A failing job is retried
+up to JOB_MAX_ATTEMPTS times in total, waiting JOB_RETRY_DELAY_SECONDS and
+doubling after each failure. On shutdown the runner stops accepting work,
+releases pending retries and waits up to JOB_DRAIN_TIMEOUT_SECONDS for the
+queue to empty.
+
+A job that fails part-way may be run again, so handlers should tolerate
+repeats. A job whose last attempt fails is dropped, logged at error level and
+counted in jobs_exhausted_total.
+
+The queue holds at most JOB_QUEUE_SIZE jobs. When it is full, enqueue() runs
+the job inline (a single attempt), so a burst slows its producers down to
+what the workers sustain instead of growing memory. Jobs also run inline when
+the runner is not started: under Mangum, which runs without lifespan events,
+or with JOB_WORKERS=0. Periodic jobs (every()) run from start() whatever the
+worker count, inline when there are no workers.
+
+InMemoryBackend loses queued jobs if the process dies. A durable store (for
+example a MongoDB collection claimed with find_one_and_update) can be passed
+to configure_backend() as any object with the same methods.
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple
+
+from metrics import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+JOB_QUEUE_SIZE = int(os.environ.get('JOB_QUEUE_SIZE', '1000'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))
+JOB_RETRY_DELAY_SECONDS = float(os.environ.get('JOB_RETRY_DELAY_SECONDS', '1'))
+JOB_DRAIN_TIMEOUT_SECONDS = float(os.environ.get('JOB_DRAIN_TIMEOUT_SECONDS', '10'))
+
+jobs_enqueued = Counter("jobs_enqueued_total", "Background jobs submitted", ["job", "mode"])
+jobs_finished = Counter("jobs_finished_total", "Background job attempts by outcome", ["job", "outcome"])
+jobs_exhausted = Counter("jobs_exhausted_total", "Background jobs dropped after their last attempt failed", ["job"])
+job_duration = Histogram("job_duration_seconds", "Background job attempt duration", ["job"])
+job_queue_depth = Gauge("job_queue_depth", "Background jobs queued or waiting to retry")
+
+registry: Dict[str, Callable[..., Awaitable[Any]]] = {}
+
+
+class Job(NamedTuple):
+    id: str
+    name: str
+    payload: dict
+    # Attempts already made
+    attempts: int = 0
+
+
+def register(name: str):
+    """Decorator registering an async handler under ``name``"""
+    def decorator(handler):
+        registry[name] = handler
+        return handler
+    return decorator
+
+
+class InMemoryBackend:
+    def __init__(self, maxsize: int = JOB_QUEUE_SIZE):
+        self.maxsize = maxsize
+        # Unbounded underneath so retries are never refused; put() enforces maxsize
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._delayed: Dict[str, tuple] = {}
+
+    async def put(self, job: Job) -> bool:
+        """Queue ``job``; False when the queue is full"""
+        if len(self) >= self.maxsize:
+            return False
+        self._queue.put_nowait(job)
+        return True
+
+    async def get(self) -> Job:
+        return await self._queue.get()
+
+    async def ack(self, job: Job):
+        pass
+
+    async def retry(self, job: Job, delay: float):
+        handle = asyncio.get_running_loop().call_later(delay, self._release, job)
+        self._delayed[job.id] = (handle, job)
+
+    def _release(self, job: Job):
+        self._delayed.pop(job.id, None)
+        self._queue.put_nowait(job)
+
+    def release_delayed(self):
+        """Make every job waiting to retry runnable now"""
+        for handle, job in list(self._delayed.values()):
+            handle.cancel()
+            self._release(job)
+
+    def __len__(self):
+        return self._queue.qsize() + len(self._delayed)
+
+
+class JobRunner:
+    def __init__(self, backend, workers: int = JOB_WORKERS):
+        self.backend = backend
+        self.workers = workers
+        self.accepting = False
+        self.scheduling = False
+        self._active = 0
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        if self.scheduling:
+            return
+        self.scheduling = True
+        if self.workers > 0:
+            self.accepting = True
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    def every(self, interval: float, name: str, **payload):
+        """Enqueue ``name`` now and then every ``interval`` seconds until drained"""
+        if interval <= 0 or not self.scheduling:
+            return
+
+        async def schedule():
+            while self.scheduling:
+                await self.enqueue(name, **payload)
+                await asyncio.sleep(interval)
+
+        self._tasks.append(asyncio.create_task(schedule()))
+
+    async def enqueue(self, name: str, **payload):
+        if name not in registry:
+            raise KeyError(f"No job registered as {name!r}")
+        job = Job(str(uuid.uuid4()), name, payload)
+        if self.accepting and await self.backend.put(job):
+            jobs_enqueued.inc(job=name, mode="queued")
+            job_queue_depth.set(len(self.backend))
+            return
+        jobs_enqueued.inc(job=name, mode="inline" if not self.accepting else "backpressure")
+        # Counted as active so drain() also waits for jobs running inline
+        self._active += 1
+        try:
+            if not await self._attempt(job):
+                self._give_up(job)
+        finally:
+            self._active -= 1
+
+    async def _work(self):
+        while True:
+            job = await self.backend.get()
+            self._active += 1
+            try:
+                succeeded = await self._attempt(job)
+                if not succeeded and job.attempts + 1 < JOB_MAX_ATTEMPTS:
+                    # While draining, retries run straight away instead of outliving the process
+                    delay = JOB_RETRY_DELAY_SECONDS * 2 ** job.attempts if self.accepting else 0
+                    await self.backend.retry(job._replace(attempts=job.attempts + 1), delay)
+                else:
+                    if not succeeded:
+                        self._give_up(job)
+                    await self.backend.ack(job)
+            except Exception:
+                logger.exception("Job backend failed handling %s %s", job.name, job.id)
+            finally:
+                self._active -= 1
+                job_queue_depth.set(len(self.backend))
+
+    async def _attempt(self, job: Job) -> bool:
+        started = time.perf_counter()
+        try:
+            await registry[job.name](**job.payload)
+        except Exception:
+            jobs_finished.inc(job=job.name, outcome="error")
+            logger.exception("Job %s %s failed (attempt %d of %d)", job.name, job.id, job.attempts + 1, JOB_MAX_ATTEMPTS)
+            return False
+        else:
+            jobs_finished.inc(job=job.name, outcome="ok")
+            return True
+        finally:
+            job_duration.observe(time.perf_counter() - started, job=job.name)
+
+    @staticmethod
+    def _give_up(job: Job):
+        jobs_exhausted.inc(job=job.name)
+        logger.error("Job %s %s dropped after %d failed attempt(s)", job.name, job.id, job.attempts + 1)
+
+    async def drain(self, timeout: float = JOB_DRAIN_TIMEOUT_SECONDS):
+        """Stop accepting jobs, finish the queued ones within ``timeout``, then stop the workers"""
+        self.scheduling = False
+        if not self._tasks:
+            return
+        self.accepting = False
+        release_delayed = getattr(self.backend, "release_delayed", None)
+        if release_delayed:
+            release_delayed()
+        deadline = time.monotonic() + timeout
+        while (len(self.backend) or self._active) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if len(self.backend):
+            logger.warning("%d background job(s) still queued at shutdown", len(self.backend))
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "accepting": self.accepting,
+            "scheduling": self.scheduling,
+            "queued": len(self.backend),
+            "active": self._active,
+        }
+
+
+runner = JobRunner(InMemoryBackend())
+
+
+def configure_backend(backend):
+    """Replace the job store; call before the runner starts"""
+    runner.backend = backend
+
+
+async def enqueue(name: str, **payload):
+    await runner.enqueue(name, **payload)
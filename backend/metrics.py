@@ -0,0 +1,157 @@
+"""Minimal in-process metrics: counters, gauges and fixed-bucket histograms.
+
+Metrics may be updated from any thread (PyMongo monitoring callbacks run on
+driver threads), so every update takes a per-metric lock. Each metric
+registers itself in REGISTRY when it is created, and render() writes the
+whole registry in the Prometheus text exposition format.
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REGISTRY = []
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _label_dict(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self):
+        """(suffix, labels, value) triples for the text exposition format"""
+        with self._lock:
+            return [("", self._label_dict(key), value) for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, total: float, **labels):
+        """Report a running total kept elsewhere (e.g. cache hit counts); never moves backwards"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = max(self._values.get(key, 0), total)
+
+    def snapshot(self):
+        with self._lock:
+            return [{"labels": self._label_dict(key), "value": value} for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            return [{"labels": self._label_dict(key), "value": value} for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum, max
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0.0]
+            state[0][index] += 1
+            state[1] += value
+            if value > state[2]:
+                state[2] = value
+
+    def snapshot(self):
+        with self._lock:
+            snapshot = []
+            for key, (counts, total, maximum) in self._values.items():
+                count = sum(counts)
+                snapshot.append({
+                    "labels": self._label_dict(key),
+                    "count": count,
+                    "sum": total,
+                    "mean": total / count if count else 0.0,
+                    "max": maximum,
+                })
+            return snapshot
+
+    def samples(self):
+        with self._lock:
+            samples = []
+            for key, (counts, total, _) in self._values.items():
+                labels = self._label_dict(key)
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    samples.append(("_bucket", dict(labels, le=_format_value(bound)), cumulative))
+                samples.append(("_sum", labels, total))
+                samples.append(("_count", labels, cumulative))
+            return samples
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for suffix, labels, value in metric.samples():
+            label_text = ",".join(f'{name}="{_escape(str(label))}"' for name, label in labels.items())
+            if label_text:
+                label_text = "{" + label_text + "}"
+            lines.append(f"{metric.name}{suffix}{label_text} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
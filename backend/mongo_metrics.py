@@ -0,0 +1,95 @@
+"""PyMongo monitoring listeners that feed the connection pool and command metrics.
+
+Motor runs PyMongo operations on worker threads, and a connection checkout
+happens synchronously on the thread that issues the operation, so the checkout
+start time is kept in a thread-local until the matching checked-out/failed
+event arrives.
+"""
+import threading
+import time
+
+from pymongo import monitoring
+
+from metrics import Counter, Gauge, Histogram
+
+pool_checkout_seconds = Histogram(
+    "mongo_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+pool_checkout_failures = Counter(
+    "mongo_pool_checkout_failures_total", "Connection checkouts that failed", ["reason"]
+)
+pool_connections_in_use = Gauge("mongo_pool_connections_in_use", "Connections currently checked out")
+pool_connections_open = Gauge("mongo_pool_connections_open", "Connections currently open")
+command_seconds = Histogram("mongo_command_duration_seconds", "MongoDB command round-trip time", ["command"])
+command_failures = Counter("mongo_command_failures_total", "MongoDB commands that failed", ["command"])
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._local = threading.local()
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def _checkout_finished(self):
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        if started is not None:
+            pool_checkout_seconds.observe(time.perf_counter() - started)
+
+    def connection_checked_out(self, event):
+        self._checkout_finished()
+        pool_connections_in_use.inc()
+
+    def connection_check_out_failed(self, event):
+        self._checkout_finished()
+        pool_checkout_failures.inc(reason=event.reason)
+
+    def connection_checked_in(self, event):
+        pool_connections_in_use.dec()
+
+    def connection_created(self, event):
+        pool_connections_open.inc()
+
+    def connection_closed(self, event):
+        pool_connections_open.dec()
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        command_seconds.observe(event.duration_micros / 1e6, command=event.command_name)
+
+    def failed(self, event):
+        command_seconds.observe(event.duration_micros / 1e6, command=event.command_name)
+        command_failures.inc(command=event.command_name)
+
+
+def snapshot() -> dict:
+    return {
+        "pool_checkout_seconds": pool_checkout_seconds.snapshot(),
+        "pool_checkout_failures": pool_checkout_failures.snapshot(),
+        "pool_connections_in_use": pool_connections_in_use.snapshot(),
+        "pool_connections_open": pool_connections_open.snapshot(),
+        "command_seconds": command_seconds.snapshot(),
+        "command_failures": command_failures.snapshot(),
+    }
@@ -0,0 +1,104 @@
+"""Keyset pagination and NDJSON streaming helpers for the list endpoints.
+
+Pages are ordered by a fixed tuple of sort fields that always ends with the
+unique ``id``. The opaque cursor handed to clients encodes the sort values of
+the last document of a page; the next page is everything strictly after it.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, List, Sequence
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any):
+    if isinstance(value, dict):
+        # Anything but an encoded datetime would reach the query as an operator expression
+        if set(value) != {"$dt"}:
+            raise ValueError("unexpected object in cursor")
+        return datetime.fromisoformat(value["$dt"])
+    if isinstance(value, list):
+        raise ValueError("unexpected list in cursor")
+    return value
+
+
+def encode_cursor(doc: dict, sort_fields: Sequence[str]) -> str:
+    values = [_encode_value(doc.get(field)) for field in sort_fields]
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_fields: Sequence[str]) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(sort_fields):
+            raise ValueError("cursor does not match the sort order")
+        return [_decode_value(value) for value in values]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def keyset_filter(query: dict, sort_fields: Sequence[str], cursor: str = None) -> dict:
+    """Extend ``query`` so it only matches documents sorted strictly after ``cursor``"""
+    if not cursor:
+        return query
+    values = decode_cursor(cursor, sort_fields)
+    branches = []
+    for position, field in enumerate(sort_fields):
+        branch = {sort_fields[i]: values[i] for i in range(position)}
+        branch[field] = {"$gt": values[position]}
+        branches.append(branch)
+    return {"$and": [query, {"$or": branches}]}
+
+
+def sort_spec(sort_fields: Sequence[str]):
+    return [(field, 1) for field in sort_fields]
+
+
+async def fetch_page(collection, query: dict, sort_fields: Sequence[str], cursor: str, limit: int, response: Response):
+    """Load one page of documents, advertising the next cursor in a response header"""
+    query = keyset_filter(query, sort_fields, cursor)
+    docs = await collection.find(query, {"_id": 0}).sort(sort_spec(sort_fields)).limit(limit + 1).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(docs[-1], sort_fields)
+    return docs
+
+
+def _json_line(obj: Any) -> str:
+    return json.dumps(jsonable_encoder(obj))
+
+
+def stream_documents(
+    collection,
+    query: dict,
+    sort_fields: Sequence[str],
+    cursor: str,
+    build: Callable[[dict], Any],
+    dumps: Callable[[Any], str] = _json_line,
+    headers: dict = None,
+) -> StreamingResponse:
+    """Stream every matching document as NDJSON while the Motor cursor yields it"""
+    query = keyset_filter(query, sort_fields, cursor)
+
+    async def lines() -> AsyncIterator[str]:
+        documents = collection.find(query, {"_id": 0}).sort(sort_spec(sort_fields)).batch_size(STREAM_BATCH_SIZE)
+        async for doc in documents:
+            yield dumps(build(doc)) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers=headers)
@@ -0,0 +1,78 @@
+"""bcrypt cost selection.
+
+The work factor is chosen per deployment rather than hard-coded:
+
+* BCRYPT_ROUNDS fixes it outright
+* otherwise PASSWORD_HASH_TARGET_MS calibrates it when the password context is
+  first built, picking the highest cost whose verify time on this machine
+  stays within the budget (bounded by BCRYPT_MIN_ROUNDS/BCRYPT_MAX_ROUNDS)
+* with neither set, passlib's default applies
+
+bcrypt time doubles with every round, so calibration times a cheap cost and
+extrapolates instead of trying every candidate. Hashes below the chosen cost
+are upgraded on the next successful login. Run this module to see what each
+cost costs here:
+
+    python password_cost.py --target-ms 250
+"""
+import argparse
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+BCRYPT_MIN_ROUNDS = int(os.environ.get('BCRYPT_MIN_ROUNDS', '10'))
+BCRYPT_MAX_ROUNDS = int(os.environ.get('BCRYPT_MAX_ROUNDS', '14'))
+CALIBRATION_ROUNDS = 8
+CALIBRATION_SAMPLES = 3
+
+
+def measure_bcrypt_ms(rounds: int, samples: int = CALIBRATION_SAMPLES) -> float:
+    """Fastest of ``samples`` bcrypt hashes at ``rounds``, in milliseconds"""
+    from passlib.hash import bcrypt
+
+    handler = bcrypt.using(rounds=rounds)
+    best = float("inf")
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash("calibration-password")
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = BCRYPT_MIN_ROUNDS, max_rounds: int = BCRYPT_MAX_ROUNDS) -> int:
+    base_ms = measure_bcrypt_ms(CALIBRATION_ROUNDS)
+    rounds = min_rounds
+    while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - CALIBRATION_ROUNDS) <= target_ms:
+        rounds += 1
+    logger.info(
+        "bcrypt cost %d selected for a %.0f ms budget (estimated %.0f ms per hash)",
+        rounds, target_ms, base_ms * 2 ** (rounds - CALIBRATION_ROUNDS),
+    )
+    return rounds
+
+
+def configured_bcrypt_rounds() -> Optional[int]:
+    """The deployment's bcrypt cost, or None for passlib's default"""
+    if os.environ.get('BCRYPT_ROUNDS'):
+        return int(os.environ['BCRYPT_ROUNDS'])
+    if os.environ.get('PASSWORD_HASH_TARGET_MS'):
+        return calibrate_bcrypt_rounds(float(os.environ['PASSWORD_HASH_TARGET_MS']))
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show bcrypt hash time per cost on this machine")
+    parser.add_argument("--target-ms", type=float, default=250)
+    args = parser.parse_args()
+
+    for rounds in range(BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS + 1):
+        print(f"rounds {rounds:>2}: {measure_bcrypt_ms(rounds, samples=1):8.1f} ms")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    calibrate_bcrypt_rounds(args.target_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Per-request MongoDB query profiler.
+
+With QUERY_PROFILING=true every operation issued through ``db`` during a
+request is recorded: collection, operation, the shape of its filter (values
+replaced by "?"), duration and number of documents returned. When the request
+finishes, the profiler
+
+* logs the full query list if the request took longer than SLOW_REQUEST_MS
+* warns when the same query shape was issued QUERY_REPEAT_THRESHOLD or more
+  times, which usually means a query inside a loop (N+1)
+* with SERVER_TIMING=true, adds a ``Server-Timing`` header so browser dev
+  tools show DB time and query count next to each response
+
+Profiling is off by default; when it is off the middleware is not installed
+and record_query() returns after a single context variable lookup.
+"""
+import json
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, List, NamedTuple, Optional
+
+QUERY_PROFILING = os.environ.get('QUERY_PROFILING', 'false').lower() in ('1', 'true', 'yes')
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'false').lower() in ('1', 'true', 'yes')
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', '500'))
+QUERY_REPEAT_THRESHOLD = int(os.environ.get('QUERY_REPEAT_THRESHOLD', '3'))
+
+logger = logging.getLogger(__name__)
+
+_request_queries: ContextVar[Optional[list]] = ContextVar("request_queries", default=None)
+
+
+class QueryRecord(NamedTuple):
+    collection: str
+    operation: str
+    shape: str
+    seconds: float
+    returned: Optional[int]
+
+    def describe(self) -> str:
+        text = f"{self.collection}.{self.operation} {self.shape} {self.seconds * 1000:.1f} ms"
+        if self.returned is not None:
+            text += f", {self.returned} doc{'' if self.returned == 1 else 's'}"
+        return text
+
+
+def query_shape(value: Any) -> Any:
+    """Replace every literal in a filter or pipeline with "?", keeping keys and operators"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, (dict, list, tuple)) for item in value):
+            return [query_shape(item) for item in value]
+        # Plain value lists ($in, $nin, ...) have the same shape whatever their length
+        return "?"
+    return "?"
+
+
+def documents_returned(result: Any) -> Optional[int]:
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return 1
+    if result is None:
+        return 0
+    return None
+
+
+def is_active() -> bool:
+    """Whether the current request is being profiled; callers skip per-query work otherwise"""
+    return _request_queries.get() is not None
+
+
+def record_query(collection: str, operation: str, spec: Any, seconds: float, returned: Optional[int]):
+    queries = _request_queries.get()
+    if queries is None:
+        return
+    shape = json.dumps(query_shape(spec), sort_keys=True) if spec is not None else "-"
+    queries.append(QueryRecord(collection, operation, shape, seconds, returned))
+
+
+def repeated_shapes(queries: List[QueryRecord]):
+    """(collection, operation, shape, count) for shapes issued at least QUERY_REPEAT_THRESHOLD times"""
+    counts = Counter((query.collection, query.operation, query.shape) for query in queries)
+    return [key + (count,) for key, count in counts.items() if count >= QUERY_REPEAT_THRESHOLD]
+
+
+def server_timing(queries: List[QueryRecord], app_seconds: float) -> str:
+    db_ms = sum(query.seconds for query in queries) * 1000
+    return f'db;dur={db_ms:.1f};desc="{len(queries)} queries", app;dur={app_seconds * 1000:.1f}'
+
+
+class QueryProfilerMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        queries: List[QueryRecord] = []
+        token = _request_queries.set(queries)
+
+        async def send_wrapper(message):
+            if SERVER_TIMING and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                value = server_timing(queries, time.perf_counter() - started)
+                headers.append((b"server-timing", value.encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_queries.reset(token)
+            self._report(scope, time.perf_counter() - started, queries)
+
+    @staticmethod
+    def _report(scope, elapsed: float, queries: List[QueryRecord]):
+        route = getattr(scope.get("route"), "path", scope["path"])
+        request = f"{scope['method']} {route}"
+
+        for collection, operation, shape, count in repeated_shapes(queries):
+            logger.warning(
+                "Possible N+1 in %s: %s.%s %s issued %d times", request, collection, operation, shape, count
+            )
+
+        if elapsed * 1000 >= SLOW_REQUEST_MS:
+            db_ms = sum(query.seconds for query in queries) * 1000
+            lines = "".join(f"\n  {query.describe()}" for query in queries)
+            logger.warning(
+                "Slow request %s took %.1f ms with %d queries (%.1f ms in MongoDB)%s",
+                request, elapsed * 1000, len(queries), db_ms, lines,
+            )
@@ -0,0 +1,123 @@
+"""Token-bucket rate limiting for the authentication endpoints.
+
+Each endpoint keeps one bucket per client IP and, where the request names an
+account, one per email address. A bucket holds up to ``capacity`` tokens and
+refills at capacity/period tokens per second, so a client may burst up to
+capacity requests and then sustain capacity per period. A request that finds
+its bucket empty is rejected with 429 and Retry-After before any password
+hashing or database work.
+
+Limits come from the environment as "<requests>/<seconds>":
+
+    RATE_LIMIT_IP (default "20/60"), RATE_LIMIT_EMAIL (default "5/300")
+
+RATE_LIMIT_ENABLED=false turns limiting off. Behind a proxy, set
+RATE_LIMIT_CLIENT_IP_HEADER (e.g. "x-forwarded-for") so the client address
+is taken from the first entry of that header instead of the socket peer.
+
+The default store keeps buckets in process memory, bounded to
+RATE_LIMIT_MAX_KEYS buckets with least-recently-used eviction. Several
+workers or serverless instances can share limits by passing configure_store()
+any object with the same ``take`` coroutine, e.g. one backed by a Redis script.
+"""
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from fastapi import HTTPException, Request, status
+
+from metrics import Counter
+
+
+class RateLimit(NamedTuple):
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+def parse_limit(value: str) -> RateLimit:
+    capacity, period = value.split("/")
+    return RateLimit(int(capacity), float(period))
+
+
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+IP_LIMIT = parse_limit(os.environ.get('RATE_LIMIT_IP', '20/60'))
+EMAIL_LIMIT = parse_limit(os.environ.get('RATE_LIMIT_EMAIL', '5/300'))
+CLIENT_IP_HEADER = os.environ.get('RATE_LIMIT_CLIENT_IP_HEADER', '').lower()
+MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '100000'))
+
+rate_limit_rejections = Counter(
+    "rate_limit_rejections_total", "Requests rejected by the rate limiter", ["endpoint", "key"]
+)
+
+
+class InMemoryStore:
+    def __init__(self, max_keys: int = MAX_KEYS):
+        self.max_keys = max_keys
+        # key -> [tokens, last refill time]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """Take one token from ``key``'s bucket; 0 if allowed, else seconds until one is available"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(limit.capacity), now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / limit.rate
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+store = InMemoryStore()
+
+
+def configure_store(new_store):
+    global store
+    store = new_store
+
+
+def client_ip(request: Request) -> str:
+    if CLIENT_IP_HEADER:
+        forwarded = request.headers.get(CLIENT_IP_HEADER)
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def enforce(endpoint: str, key: str, value: str, limit: RateLimit):
+    if not RATE_LIMIT_ENABLED:
+        return
+    retry_after = await store.take(f"{endpoint}:{key}:{value}", limit)
+    if retry_after:
+        rate_limit_rejections.inc(endpoint=endpoint, key=key)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def limit_by_ip(endpoint: str):
+    """Route dependency that throttles ``endpoint`` per client IP"""
+    async def dependency(request: Request):
+        await enforce(endpoint, "ip", client_ip(request), IP_LIMIT)
+    return dependency
+
+
+async def limit_by_email(endpoint: str, email: str):
+    await enforce(endpoint, "email", email.strip().lower(), EMAIL_LIMIT)
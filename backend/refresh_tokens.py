@@ -0,0 +1,88 @@
+"""Rotating refresh tokens.
+
+A refresh token is an opaque random string; only its SHA-256 is stored. Every
+token belongs to a family that starts at login or registration. Each use
+marks the presented token as used and issues its successor in the same
+family.
+
+Presenting a token that was already used means a copy of it exists
+elsewhere. Outside a short grace window for tabs that refresh at the same
+moment, that is treated as theft and the whole family is revoked, which logs
+out both the attacker and the legitimate holder.
+
+Documents expire through a TTL index on ``expires_at``.
+"""
+import hashlib
+import os
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from pymongo import ReturnDocument
+
+REFRESH_TOKEN_EXPIRE_DAYS = float(os.environ.get('REFRESH_TOKEN_EXPIRE_DAYS', '7'))
+REFRESH_REUSE_GRACE_SECONDS = float(os.environ.get('REFRESH_REUSE_GRACE_SECONDS', '10'))
+
+
+class RefreshResult(NamedTuple):
+    user_id: Optional[str]
+    family_id: Optional[str]
+    # "ok", "invalid", "concurrent" (used moments ago) or "reused" (family revoked)
+    outcome: str
+
+
+def _hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def issue_refresh_token(db, user_id: str, family_id: Optional[str] = None) -> str:
+    token = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    await db.refresh_tokens.insert_one({
+        "token_hash": _hash(token),
+        "user_id": user_id,
+        "family_id": family_id or str(uuid.uuid4()),
+        "created_at": now,
+        "expires_at": now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        "used_at": None,
+    })
+    return token
+
+
+async def use_refresh_token(db, token: str) -> RefreshResult:
+    """Atomically mark ``token`` as used; the caller issues the successor on "ok" """
+    now = datetime.utcnow()
+    token_hash = _hash(token)
+    doc = await db.refresh_tokens.find_one_and_update(
+        {"token_hash": token_hash, "used_at": None, "expires_at": {"$gt": now}},
+        {"$set": {"used_at": now}},
+        projection={"_id": 0, "user_id": 1, "family_id": 1},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if doc:
+        return RefreshResult(doc["user_id"], doc["family_id"], "ok")
+
+    used = await db.refresh_tokens.find_one({"token_hash": token_hash}, {"_id": 0, "user_id": 1, "family_id": 1, "used_at": 1})
+    if not used or used["used_at"] is None:
+        return RefreshResult(None, None, "invalid")
+    if used["used_at"] > now - timedelta(seconds=REFRESH_REUSE_GRACE_SECONDS):
+        return RefreshResult(used["user_id"], used["family_id"], "concurrent")
+    await revoke_family(db, used["family_id"])
+    return RefreshResult(used["user_id"], used["family_id"], "reused")
+
+
+async def revoke_family(db, family_id: str):
+    await db.refresh_tokens.delete_many({"family_id": family_id})
+
+
+async def revoke_token_family(db, token: str):
+    """Log out the session ``token`` belongs to"""
+    doc = await db.refresh_tokens.find_one({"token_hash": _hash(token)}, {"_id": 0, "family_id": 1})
+    if doc:
+        await revoke_family(db, doc["family_id"])
+
+
+async def revoke_user(db, user_id: str):
+    """Log out every session of ``user_id`` (password reset)"""
+    await db.refresh_tokens.delete_many({"user_id": user_id})
@@ -1,44 +1,147 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, APIRouter, BackgroundTasks, HTTPException, Depends, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from mangum import Mangum
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from typing import List, Literal, Optional
 import uuid
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
 import jwt
-from email_validator import validate_email, EmailNotValidError
+import hashlib
+import hmac
 import secrets
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cache import TTLCache
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, fetch_page, stream_documents
+import dashboard_stats
+import refresh_tokens
+import password_cost
+import rate_limit
+import events
+import jobs
+import sync
+from timeutils import as_naive_utc, as_stored
+from cycle_schedule import CYCLE_ROLLOVER_INTERVAL_SECONDS, DERIVED_FIELDS, annotate_cycle, annotate_cycles, complete_overdue_cycles, weeks_completed
+from conditional import bump_data_version, not_modified
+from database import db, close_client, get_database
+import mongo_metrics
+import metrics
+from instrumentation import RequestMetricsMiddleware, TimedRoute, timed_phase
+from query_profiler import QUERY_PROFILING, QueryProfilerMiddleware
+
+
+try:
+    import orjson
+except ImportError:  # optional, only needed for FAST_JSON
+    orjson = None
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Opt-in fast serialisation: trusted DB documents skip model re-validation and are encoded with orjson
+FAST_JSON = os.environ.get('FAST_JSON', 'false').lower() in ('1', 'true', 'yes')
+if FAST_JSON and orjson is None:
+    logging.getLogger(__name__).warning("FAST_JSON is enabled but orjson is not installed; using the standard JSON path")
+    FAST_JSON = False
+
+# MongoDB connection; with LAZY_INIT the client is created by the first request that needs it
+LAZY_INIT = os.environ.get('LAZY_INIT', 'false').lower() in ('1', 'true', 'yes')
+if not LAZY_INIT:
+    get_database()
 
 # Create the main app without a prefix
-app = FastAPI(title="Manifest 12 API", description="12-Week Goal Manifestation Platform")
+app = FastAPI(
+    title="Manifest 12 API",
+    description="12-Week Goal Manifestation Platform",
+    default_response_class=ORJSONResponse if FAST_JSON else JSONResponse,
+)
 
 # Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", route_class=TimedRoute)
 
 # Security configuration
 SECRET_KEY = os.environ['SECRET_KEY']
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
+# Access tokens are short-lived and carry the user's claims; sessions are kept alive
+# through rotating refresh tokens (see refresh_tokens.py)
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get('ACCESS_TOKEN_EXPIRE_MINUTES', '15'))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+# The password context is built on first use so processes that never hash skip passlib
+# entirely, and so bcrypt cost calibration runs on a password worker rather than at import
+_pwd_context = None
+_pwd_context_lock = threading.Lock()
+bcrypt_rounds = None
+
+def get_pwd_context():
+    global _pwd_context, bcrypt_rounds
+    if _pwd_context is None:
+        with _pwd_context_lock:
+            if _pwd_context is None:
+                from passlib.context import CryptContext
+                bcrypt_rounds = password_cost.configured_bcrypt_rounds()
+                if bcrypt_rounds is None:
+                    _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+                else:
+                    # min_rounds marks weaker hashes as needing an update; stronger ones are kept
+                    _pwd_context = CryptContext(
+                        schemes=["bcrypt"],
+                        deprecated="auto",
+                        bcrypt__default_rounds=bcrypt_rounds,
+                        bcrypt__min_rounds=bcrypt_rounds,
+                    )
+    return _pwd_context
+
+# Password hashing runs on a dedicated, bounded pool so bcrypt never blocks the event loop
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '2'))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.environ.get('PASSWORD_HASH_QUEUE_LIMIT', '32'))
+
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+password_tasks_pending = 0
+
+# Authenticated users are cached in-process to skip the users lookup on every request
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', '1024'))
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', '60'))
+
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+# Verified token claims, keyed by the token's SHA-256 and expiring with the token,
+# so repeat requests skip the signature check
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '4096'))
+
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+# Latest token_version of users whose tokens were revoked by this process; entries only
+# need to outlive the access tokens issued before the revocation. While an evicted entry
+# could still matter, claims-bearing tokens are checked against the stored token_version
+TOKEN_REVOCATION_CACHE_SIZE = int(os.environ.get('TOKEN_REVOCATION_CACHE_SIZE', '10000'))
+
+token_revocations = TTLCache(maxsize=TOKEN_REVOCATION_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+# Cycle ownership and start dates, so goal and reflection inserts skip the cycle read.
+# Ownership never changes and cycles are never deleted; update/complete still invalidate
+CYCLE_CACHE_SIZE = int(os.environ.get('CYCLE_CACHE_SIZE', '4096'))
+CYCLE_CACHE_TTL_SECONDS = float(os.environ.get('CYCLE_CACHE_TTL_SECONDS', '300'))
+
+cycle_cache = TTLCache(maxsize=CYCLE_CACHE_SIZE, ttl=CYCLE_CACHE_TTL_SECONDS)
+
+# Goal progress history is stored as fixed-size buckets of snapshots per goal
+PROGRESS_BUCKET_SIZE = int(os.environ.get('PROGRESS_BUCKET_SIZE', '100'))
+
 # Authentication Models
 class UserCreate(BaseModel):
     email: EmailStr
@@ -54,6 +157,7 @@ class User(BaseModel):
     email: str
     full_name: str
     is_active: bool = True
+    token_version: int = 0  # tokens issued with an older "ver" claim are revoked
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -68,6 +172,15 @@ class Token(BaseModel):
     access_token: str
     token_type: str
     user: UserResponse
+    refresh_token: str
+    expires_in: int  # access token lifetime in seconds
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+# Statuses clients may set; dashboard_stats keeps one counter per status
+CycleStatus = Literal["active", "completed", "paused", "archived"]
+GoalStatus = Literal["not_started", "in_progress", "completed", "on_hold"]
 
 # 12-Week Cycle Models
 class CycleCreate(BaseModel):
@@ -76,6 +189,11 @@ class CycleCreate(BaseModel):
     law_of_attraction_statement: str
     start_date: datetime = Field(default_factory=datetime.utcnow)
 
+class CycleWeek(BaseModel):
+    week_number: int
+    start_date: datetime
+    end_date: datetime
+
 class Cycle(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
@@ -84,7 +202,10 @@ class Cycle(BaseModel):
     start_date: datetime
     end_date: datetime
     status: str = "active"  # active, completed, paused, archived
+    # Derived from the dates whenever a cycle is returned (cycle_schedule.annotate_cycles)
     current_week: int = 1
+    days_remaining: int = 0
+    weeks: List[CycleWeek] = []
     law_of_attraction_statement: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -126,7 +247,7 @@ class Goal(BaseModel):
 
 class GoalUpdate(BaseModel):
     progress: Optional[int] = None
-    status: Optional[str] = None
+    status: Optional[GoalStatus] = None
     milestones: Optional[List[Milestone]] = None
 
 # Weekly Reflection Models  
@@ -174,6 +295,8 @@ class PasswordResetToken(BaseModel):
 
 # Enhanced Analytics Models
 class GoalProgressSnapshot(BaseModel):
+    # Lets a retried history write recognise snapshots it already stored
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     date: datetime
     progress: int
     notes: str = ""
@@ -209,13 +332,49 @@ class GoalProgressUpdate(BaseModel):
     notes: str = ""
     milestone_updates: Optional[List[Milestone]] = None
 
+class GoalBatchItem(BaseModel):
+    goal_id: str
+    progress: Optional[int] = None  # records a progress snapshot, like /goals/{goal_id}/progress
+    notes: str = ""
+    status: Optional[GoalStatus] = None  # overrides the status derived from progress
+    milestones: Optional[List[Milestone]] = None
+
+class GoalBatchRequest(BaseModel):
+    updates: List[GoalBatchItem]
+
+class GoalBatchItemResult(BaseModel):
+    goal_id: str
+    success: bool
+    goal: Optional[Goal] = None
+    error: Optional[str] = None
+
+class GoalBatchResponse(BaseModel):
+    results: List[GoalBatchItemResult]
+
+# Change Feed Models
+class SyncProgressSnapshot(GoalProgressSnapshot):
+    goal_id: str
+
+class Tombstone(BaseModel):
+    collection: str  # cycles, goals, reflections
+    id: str
+    deleted_at: datetime
+
+class SyncResponse(BaseModel):
+    cycles: List[Cycle] = []
+    goals: List[Goal] = []
+    reflections: List[WeeklyReflection] = []
+    progress_snapshots: List[SyncProgressSnapshot] = []
+    tombstones: List[Tombstone] = []
+    full_resync: bool
+    next_token: str
+
 class CycleComplete(BaseModel):
     completion_notes: str
     success_story: str = ""
     overall_satisfaction: int = 5  # 1-10 scale
 class CycleUpdate(BaseModel):
-    current_week: Optional[int] = None
-    status: Optional[str] = None
+    status: Optional[CycleStatus] = None
     law_of_attraction_statement: Optional[str] = None
 class StatusCheck(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -227,10 +386,37 @@ class StatusCheckCreate(BaseModel):
 
 # Authentication helper functions
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+def password_needs_rehash(hashed_password) -> bool:
+    return get_pwd_context().needs_update(hashed_password)
+
+async def rehash_password(user_id: str, password: str, old_hash: str):
+    """Upgrade a stale hash after login; skipped if the pool is busy or the password changed meanwhile"""
+    try:
+        new_hash = await run_password_task(get_password_hash, password)
+    except HTTPException:
+        return
+    await db.users.update_one({"id": user_id, "password_hash": old_hash}, {"$set": {"password_hash": new_hash}})
+
+async def run_password_task(func, *args):
+    """Run a password hashing call on the password pool, shedding load when it is saturated"""
+    global password_tasks_pending
+    if password_tasks_pending >= PASSWORD_HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    password_tasks_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        password_tasks_pending -= 1
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -243,27 +429,176 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    with timed_phase("auth"):
+        return await authenticate_credentials(credentials)
+
+async def authenticate_credentials(credentials: HTTPAuthorizationCredentials):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+    token_key = hashlib.sha256(credentials.credentials.encode()).digest()
+    claims = token_cache.get(token_key)
+    if claims is None:
+        try:
+            payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        except jwt.PyJWTError:
             raise credentials_exception
-    except jwt.PyJWTError:
-        raise credentials_exception
+        # Scoped tokens (event stream tickets) are not access tokens
+        if payload.get("sub") is None or "scope" in payload:
+            raise credentials_exception
+        claims = (payload["sub"], payload.get("ver", 0), user_from_claims(payload))
+        token_cache.set(token_key, claims, ttl=payload["exp"] - time.time())
+    user_id, token_version, current_user = claims
     
-    user = await db.users.find_one({"id": user_id})
-    if user is None:
+    if current_user is not None:
+        # Claims-bearing access token: no database lookup, only the in-memory revocation check
+        revoked_below = token_revocations.get(user_id)
+        if revoked_below is not None:
+            if token_version < revoked_below:
+                raise credentials_exception
+            return current_user
+        if token_revocations.evicted_until <= time.monotonic():
+            return current_user
+        # The user's revocation may have been evicted; check the stored token_version below
+    
+    # Tokens issued before access tokens carried claims, or whose revocation may have been evicted
+    current_user = user_cache.get(user_id)
+    if current_user is None:
+        user = await db.users.find_one({"id": user_id})
+        if user is None:
+            raise credentials_exception
+        current_user = User(**user)
+        user_cache.set(user_id, current_user)
+    if token_version != current_user.token_version:
         raise credentials_exception
-    return User(**user)
+    return current_user
+
+def access_token_claims(user: dict) -> dict:
+    return {
+        "sub": user["id"],
+        "email": user["email"],
+        "name": user["full_name"],
+        "active": user.get("is_active", True),
+        "ver": user.get("token_version", 0),
+    }
+
+def user_from_claims(payload: dict) -> Optional[User]:
+    if "email" not in payload:
+        return None
+    return User(
+        id=payload["sub"],
+        email=payload["email"],
+        full_name=payload.get("name", ""),
+        is_active=payload.get("active", True),
+        token_version=payload.get("ver", 0),
+    )
+
+async def issue_tokens(user: dict, family_id: Optional[str] = None) -> Token:
+    """Access token plus a refresh token, continuing ``family_id`` when rotating"""
+    access_token = create_access_token(
+        data=access_token_claims(user), expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    refresh_token = await refresh_tokens.issue_refresh_token(db, user["id"], family_id)
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        user=UserResponse(**user),
+        refresh_token=refresh_token,
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+async def load_owned_cycle(cycle_id: str, user_id: str) -> Optional[dict]:
+    """The cycle's id and start_date if ``user_id`` owns it, from cycle_cache when possible"""
+    key = (user_id, cycle_id)
+    cycle = cycle_cache.get(key)
+    if cycle is None:
+        cycle = await db.cycles.find_one({"id": cycle_id, "user_id": user_id}, {"_id": 0, "id": 1, "start_date": 1})
+        if cycle is not None:
+            cycle_cache.set(key, cycle)
+    return cycle
+
+def invalidate_user_cache(user_id: str):
+    """Drop a cached user; call whenever the user document changes (password reset, deactivation)"""
+    user_cache.invalidate(user_id)
+
+# Response helpers
+def trusted_dump(model_cls, doc: dict) -> dict:
+    """Project a trusted DB document onto a model's fields without validating it"""
+    dumped = {}
+    for name, field in model_cls.model_fields.items():
+        dumped[name] = doc[name] if name in doc else field.get_default(call_default_factory=True)
+    return dumped
+
+def model_response(model_cls, doc: dict):
+    if FAST_JSON:
+        return ORJSONResponse(trusted_dump(model_cls, doc))
+    return model_cls(**doc)
+
+def model_list_response(model_cls, docs: list, response: Response):
+    if FAST_JSON:
+        return ORJSONResponse([trusted_dump(model_cls, doc) for doc in docs], headers=dict(response.headers))
+    return [model_cls(**doc) for doc in docs]
+
+def stream_models(collection, query: dict, sort_fields, cursor: Optional[str], model_cls, response: Response, prepare=None):
+    """``prepare`` adjusts each document in place before it is serialised"""
+    headers = dict(response.headers)
+    prepare = prepare or (lambda doc: doc)
+    if FAST_JSON:
+        return stream_documents(collection, query, sort_fields, cursor, lambda doc: trusted_dump(model_cls, prepare(doc)), dumps=lambda obj: orjson.dumps(obj).decode(), headers=headers)
+    return stream_documents(collection, query, sort_fields, cursor, lambda doc: model_cls(**prepare(doc)), headers=headers)
+
+# Progress history helpers
+def progress_snapshot_update(goal_id: str, user_id: str, snapshot: GoalProgressSnapshot, written_at: datetime):
+    """Filter and update (to run with upsert=True) that push a snapshot into the goal's open
+    bucket, starting a new bucket once it is full. ``written_at`` is when the snapshot is
+    stored, which /api/sync reads changes by; ``date`` is when the progress was reported"""
+    return (
+        {"goal_id": goal_id, "count": {"$lt": PROGRESS_BUCKET_SIZE}},
+        {
+            "$push": {"snapshots": dict(snapshot.dict(), written_at=written_at)},
+            "$inc": {"count": 1},
+            "$min": {"first_date": snapshot.date},
+            "$max": {"last_date": snapshot.date, "written_at": written_at},
+            "$setOnInsert": {"user_id": user_id},
+        },
+    )
+
+async def record_change(user_id: str, kind: str, action: str, docs: List[dict]):
+    """Bump the user's data version and push the change to any event streams the user
+    has open; the affected cycles' analytics follow from a background job"""
+    await bump_data_version(db, user_id)
+    if not docs or not events.broker.has_subscribers(user_id):
+        return
+    for doc in docs:
+        events.publish_change(user_id, kind, action, doc)
+    cycle_ids = sorted({doc["id"] if kind == "cycle" else doc["cycle_id"] for doc in docs})
+    await jobs.enqueue("cycle.analytics", user_id=user_id, cycle_ids=cycle_ids)
+
+def progress_status(progress: int) -> Optional[str]:
+    """Goal status implied by a progress value, if any"""
+    if progress >= 100:
+        return "completed"
+    if progress > 0:
+        return "in_progress"
+    return None
+
+def downsample(points: list, max_points: int) -> list:
+    """Pick at most max_points evenly spaced points, always keeping the first and last"""
+    if len(points) <= max_points:
+        return points
+    last = len(points) - 1
+    return [points[round(i * last / (max_points - 1))] for i in range(max_points)]
 
 # Authentication Routes
-@api_router.post("/auth/register", response_model=Token)
+def email_already_registered() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Email already registered"
+    )
+
+@api_router.post("/auth/register", response_model=Token, dependencies=[Depends(rate_limit.limit_by_ip("register"))])
 async def register(user_data: UserCreate):
     # Validate password length
     if len(user_data.password) < 6:
@@ -275,13 +610,10 @@ async def register(user_data: UserCreate):
     # Check if user already exists
     existing_user = await db.users.find_one({"email": user_data.email})
     if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
+        raise email_already_registered()
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await run_password_task(get_password_hash, user_data.password)
     user = User(
         email=user_data.email,
         full_name=user_data.full_name
@@ -290,49 +622,62 @@ async def register(user_data: UserCreate):
     user_dict = user.dict()
     user_dict["password_hash"] = hashed_password
     
-    await db.users.insert_one(user_dict)
-    
-    # Create access token
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
-    )
+    try:
+        await db.users.insert_one(user_dict)
+    except DuplicateKeyError:
+        # A concurrent registration won the race past the check above (unique email index)
+        raise email_already_registered()
     
-    return Token(
-        access_token=access_token,
-        token_type="bearer",
-        user=UserResponse(**user.dict())
-    )
+    return await issue_tokens(user.dict())
 
-@api_router.post("/auth/login", response_model=Token)
-async def login(user_data: UserLogin):
+@api_router.post("/auth/login", response_model=Token, dependencies=[Depends(rate_limit.limit_by_ip("login"))])
+async def login(user_data: UserLogin, background_tasks: BackgroundTasks):
+    await rate_limit.limit_by_email("login", user_data.email)
     user = await db.users.find_one({"email": user_data.email})
-    if not user or not verify_password(user_data.password, user["password_hash"]):
+    if not user or not await run_password_task(verify_password, user_data.password, user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # Not a job: the payload is the plaintext password, which must never reach a durable job store
+    if password_needs_rehash(user["password_hash"]):
+        background_tasks.add_task(rehash_password, user["id"], user_data.password, user["password_hash"])
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user["id"]}, expires_delta=access_token_expires
-    )
-    
-    user_response = UserResponse(**user)
-    return Token(
-        access_token=access_token,
-        token_type="bearer",
-        user=user_response
-    )
+    return await issue_tokens(user)
+
+@api_router.post("/auth/refresh", response_model=Token, dependencies=[Depends(rate_limit.limit_by_ip("refresh"))])
+async def refresh_access_token(request: RefreshRequest):
+    """Exchange a refresh token for a new token pair; each refresh token works once"""
+    result = await refresh_tokens.use_refresh_token(db, request.refresh_token)
+    if result.outcome == "reused":
+        logger.warning("Refresh token reuse for user %s; session family revoked", result.user_id)
+    user = await db.users.find_one({"id": result.user_id}) if result.outcome == "ok" else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await issue_tokens(user, result.family_id)
+
+@api_router.post("/auth/logout")
+async def logout(request: RefreshRequest):
+    await refresh_tokens.revoke_token_family(db, request.refresh_token)
+    return {"message": "Logged out"}
 
 @api_router.get("/auth/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
-    return UserResponse(**current_user.dict())
+    # Access token claims carry no timestamps, so the profile comes from the database
+    user = await db.users.find_one({"id": current_user.id})
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return UserResponse(**user)
 
 # Password Reset Routes
-@api_router.post("/auth/forgot-password")
+@api_router.post("/auth/forgot-password", dependencies=[Depends(rate_limit.limit_by_ip("forgot-password"))])
 async def forgot_password(request: PasswordResetRequest):
+    await rate_limit.limit_by_email("forgot-password", request.email)
     user = await db.users.find_one({"email": request.email})
     if not user:
         # For security, don't reveal if email exists or not
@@ -359,7 +704,7 @@ async def forgot_password(request: PasswordResetRequest):
         "expires_in_minutes": 60
     }
 
-@api_router.post("/auth/reset-password")
+@api_router.post("/auth/reset-password", dependencies=[Depends(rate_limit.limit_by_ip("reset-password"))])
 async def reset_password(request: PasswordResetConfirm):
     # Find valid reset token
     reset_token_doc = await db.password_reset_tokens.find_one({
@@ -382,11 +727,19 @@ async def reset_password(request: PasswordResetConfirm):
         )
     
     # Update user password
-    new_password_hash = get_password_hash(request.new_password)
-    await db.users.update_one(
+    new_password_hash = await run_password_task(get_password_hash, request.new_password)
+    user = await db.users.find_one_and_update(
         {"id": reset_token_doc["user_id"]},
-        {"$set": {"password_hash": new_password_hash, "updated_at": datetime.utcnow()}}
+        {"$set": {"password_hash": new_password_hash, "updated_at": datetime.utcnow()}, "$inc": {"token_version": 1}},
+        projection={"_id": 0, "token_version": 1},
+        return_document=ReturnDocument.AFTER
     )
+    # Sessions and tokens from before the reset stop working: refresh tokens are deleted,
+    # and access tokens carry an older token_version
+    await refresh_tokens.revoke_user(db, reset_token_doc["user_id"])
+    if user:
+        token_revocations.set(reset_token_doc["user_id"], user["token_version"])
+    invalidate_user_cache(reset_token_doc["user_id"])
     
     # Mark token as used
     await db.password_reset_tokens.update_one(
@@ -396,7 +749,7 @@ async def reset_password(request: PasswordResetConfirm):
     
     return {"message": "Password reset successful"}
 
-@api_router.post("/auth/validate-reset-token")
+@api_router.post("/auth/validate-reset-token", dependencies=[Depends(rate_limit.limit_by_ip("validate-reset-token"))])
 async def validate_reset_token(token: str):
     """Validate if a reset token is still valid"""
     reset_token_doc = await db.password_reset_tokens.find_one({
@@ -425,43 +778,69 @@ async def create_cycle(cycle_data: CycleCreate, current_user: User = Depends(get
         law_of_attraction_statement=cycle_data.law_of_attraction_statement
     )
     
-    await db.cycles.insert_one(cycle.dict())
-    return cycle
+    await db.cycles.insert_one(cycle.dict(exclude=DERIVED_FIELDS))
+    # Cached as the DB read would return it, so reflections get the same week_start_date either way
+    cycle_cache.set((current_user.id, cycle.id), {"id": cycle.id, "start_date": as_stored(cycle.start_date)})
+    await dashboard_stats.record_cycle_created(db, current_user.id, cycle.status)
+    created = annotate_cycle(cycle.dict())
+    await record_change(current_user.id, "cycle", "created", [created])
+    return Cycle(**created)
+
+CYCLE_SORT_FIELDS = ("created_at", "id")
 
 @api_router.get("/cycles", response_model=List[Cycle])
-async def get_user_cycles(current_user: User = Depends(get_current_user)):
-    cycles = await db.cycles.find({"user_id": current_user.id}, {"_id": 0}).to_list(100)
-    return [Cycle(**cycle) for cycle in cycles]
+async def get_user_cycles(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = False,
+    current_user: User = Depends(get_current_user),
+):
+    cached = await not_modified(db, request, response, current_user.id)
+    if cached:
+        return cached
+    
+    query = {"user_id": current_user.id}
+    if stream:
+        return stream_models(db.cycles, query, CYCLE_SORT_FIELDS, cursor, Cycle, response, prepare=annotate_cycle)
+    
+    cycles = await fetch_page(db.cycles, query, CYCLE_SORT_FIELDS, cursor, limit, response)
+    return model_list_response(Cycle, annotate_cycles(cycles), response)
 
 @api_router.get("/cycles/{cycle_id}", response_model=Cycle)
 async def get_cycle(cycle_id: str, current_user: User = Depends(get_current_user)):
     cycle = await db.cycles.find_one({"id": cycle_id, "user_id": current_user.id})
     if not cycle:
         raise HTTPException(status_code=404, detail="Cycle not found")
-    return Cycle(**cycle)
+    return model_response(Cycle, annotate_cycle(cycle))
 
 @api_router.put("/cycles/{cycle_id}", response_model=Cycle)
 async def update_cycle(cycle_id: str, cycle_update: CycleUpdate, current_user: User = Depends(get_current_user)):
-    cycle = await db.cycles.find_one({"id": cycle_id, "user_id": current_user.id})
-    if not cycle:
-        raise HTTPException(status_code=404, detail="Cycle not found")
-    
     update_data = cycle_update.dict(exclude_unset=True)
     update_data["updated_at"] = datetime.utcnow()
     
-    await db.cycles.update_one(
+    # The pre-image gives the dashboard stats the previous status; the response is it plus the $set
+    cycle = await db.cycles.find_one_and_update(
         {"id": cycle_id, "user_id": current_user.id},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE
     )
+    if not cycle:
+        raise HTTPException(status_code=404, detail="Cycle not found")
+    cycle_cache.invalidate((current_user.id, cycle_id))
+    if "status" in update_data:
+        await dashboard_stats.record_cycle_status_change(db, current_user.id, cycle.get("status", "active"), update_data["status"])
+    updated = annotate_cycle({**cycle, **update_data})
+    await record_change(current_user.id, "cycle", "updated", [updated])
     
-    updated_cycle = await db.cycles.find_one({"id": cycle_id, "user_id": current_user.id})
-    return Cycle(**updated_cycle)
+    return Cycle(**updated)
 
 # Goal Management Routes
 @api_router.post("/goals", response_model=Goal)
 async def create_goal(goal_data: GoalCreate, current_user: User = Depends(get_current_user)):
     # Verify cycle belongs to user
-    cycle = await db.cycles.find_one({"id": goal_data.cycle_id, "user_id": current_user.id})
+    cycle = await load_owned_cycle(goal_data.cycle_id, current_user.id)
     if not cycle:
         raise HTTPException(status_code=404, detail="Cycle not found")
     
@@ -479,46 +858,66 @@ async def create_goal(goal_data: GoalCreate, current_user: User = Depends(get_cu
     )
     
     await db.goals.insert_one(goal.dict())
+    await dashboard_stats.record_goal_created(db, current_user.id, goal.status)
+    await record_change(current_user.id, "goal", "created", [goal.dict()])
     return goal
 
+GOAL_SORT_FIELDS = ("created_at", "id")
+
 @api_router.get("/goals", response_model=List[Goal])
-async def get_user_goals(cycle_id: str = None, current_user: User = Depends(get_current_user)):
+async def get_user_goals(
+    request: Request,
+    response: Response,
+    cycle_id: str = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = False,
+    current_user: User = Depends(get_current_user),
+):
+    cached = await not_modified(db, request, response, current_user.id)
+    if cached:
+        return cached
+    
     query = {"user_id": current_user.id}
     if cycle_id:
         query["cycle_id"] = cycle_id
+    if stream:
+        return stream_models(db.goals, query, GOAL_SORT_FIELDS, cursor, Goal, response)
     
-    goals = await db.goals.find(query, {"_id": 0}).to_list(100)
-    return [Goal(**goal) for goal in goals]
+    goals = await fetch_page(db.goals, query, GOAL_SORT_FIELDS, cursor, limit, response)
+    return model_list_response(Goal, goals, response)
 
 @api_router.get("/goals/{goal_id}", response_model=Goal)
 async def get_goal(goal_id: str, current_user: User = Depends(get_current_user)):
     goal = await db.goals.find_one({"id": goal_id, "user_id": current_user.id})
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
-    return Goal(**goal)
+    return model_response(Goal, goal)
 
 @api_router.put("/goals/{goal_id}", response_model=Goal)
 async def update_goal(goal_id: str, goal_update: GoalUpdate, current_user: User = Depends(get_current_user)):
-    goal = await db.goals.find_one({"id": goal_id, "user_id": current_user.id})
-    if not goal:
-        raise HTTPException(status_code=404, detail="Goal not found")
-    
     update_data = goal_update.dict(exclude_unset=True)
     update_data["updated_at"] = datetime.utcnow()
     
-    await db.goals.update_one(
+    goal = await db.goals.find_one_and_update(
         {"id": goal_id, "user_id": current_user.id},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE
     )
+    if not goal:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    if "status" in update_data:
+        await dashboard_stats.record_goal_status_change(db, current_user.id, goal.get("status", "not_started"), update_data["status"])
+    updated = {**goal, **update_data}
+    await record_change(current_user.id, "goal", "updated", [updated])
     
-    updated_goal = await db.goals.find_one({"id": goal_id, "user_id": current_user.id})
-    return Goal(**updated_goal)
+    return Goal(**updated)
 
 # Weekly Reflection Routes
 @api_router.post("/reflections", response_model=WeeklyReflection)
 async def create_reflection(reflection_data: WeeklyReflectionCreate, current_user: User = Depends(get_current_user)):
     # Verify cycle belongs to user
-    cycle = await db.cycles.find_one({"id": reflection_data.cycle_id, "user_id": current_user.id})
+    cycle = await load_owned_cycle(reflection_data.cycle_id, current_user.id)
     if not cycle:
         raise HTTPException(status_code=404, detail="Cycle not found")
     
@@ -541,31 +940,45 @@ async def create_reflection(reflection_data: WeeklyReflectionCreate, current_use
     )
     
     await db.reflections.insert_one(reflection.dict())
+    await dashboard_stats.record_reflection_created(db, current_user.id, reflection.dict())
+    await record_change(current_user.id, "reflection", "created", [reflection.dict()])
     return reflection
 
+REFLECTION_SORT_FIELDS = ("week_number", "created_at", "id")
+
 @api_router.get("/reflections", response_model=List[WeeklyReflection])
-async def get_reflections(cycle_id: str = None, current_user: User = Depends(get_current_user)):
+async def get_reflections(
+    request: Request,
+    response: Response,
+    cycle_id: str = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = False,
+    current_user: User = Depends(get_current_user),
+):
+    cached = await not_modified(db, request, response, current_user.id)
+    if cached:
+        return cached
+    
     query = {"user_id": current_user.id}
     if cycle_id:
         query["cycle_id"] = cycle_id
+    if stream:
+        return stream_models(db.reflections, query, REFLECTION_SORT_FIELDS, cursor, WeeklyReflection, response)
     
-    reflections = await db.reflections.find(query, {"_id": 0}).sort("week_number", 1).to_list(100)
-    return [WeeklyReflection(**reflection) for reflection in reflections]
+    reflections = await fetch_page(db.reflections, query, REFLECTION_SORT_FIELDS, cursor, limit, response)
+    return model_list_response(WeeklyReflection, reflections, response)
 
 @api_router.get("/reflections/{reflection_id}", response_model=WeeklyReflection)
 async def get_reflection(reflection_id: str, current_user: User = Depends(get_current_user)):
     reflection = await db.reflections.find_one({"id": reflection_id, "user_id": current_user.id})
     if not reflection:
         raise HTTPException(status_code=404, detail="Reflection not found")
-    return WeeklyReflection(**reflection)
+    return model_response(WeeklyReflection, reflection)
 
 # Enhanced Goal Analytics Routes
 @api_router.post("/goals/{goal_id}/progress", response_model=Goal)
 async def update_goal_progress(goal_id: str, progress_update: GoalProgressUpdate, current_user: User = Depends(get_current_user)):
-    goal = await db.goals.find_one({"id": goal_id, "user_id": current_user.id})
-    if not goal:
-        raise HTTPException(status_code=404, detail="Goal not found")
-    
     # Create progress snapshot
     snapshot = GoalProgressSnapshot(
         date=datetime.utcnow(),
@@ -582,87 +995,230 @@ async def update_goal_progress(goal_id: str, progress_update: GoalProgressUpdate
     if progress_update.milestone_updates:
         update_data["milestones"] = [m.dict() for m in progress_update.milestone_updates]
     
-    if progress_update.progress >= 100:
-        update_data["status"] = "completed"
-    elif progress_update.progress > 0:
-        update_data["status"] = "in_progress"
-    
-    # Store progress history
-    history_doc = await db.goal_progress_history.find_one({"goal_id": goal_id})
-    if history_doc:
-        await db.goal_progress_history.update_one(
-            {"goal_id": goal_id},
-            {"$push": {"snapshots": snapshot.dict()}}
-        )
-    else:
-        history = GoalProgressHistory(goal_id=goal_id, snapshots=[snapshot])
-        await db.goal_progress_history.insert_one(history.dict())
+    new_status = progress_status(progress_update.progress)
+    if new_status:
+        update_data["status"] = new_status
     
-    await db.goals.update_one(
+    goal = await db.goals.find_one_and_update(
         {"id": goal_id, "user_id": current_user.id},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE
     )
+    if not goal:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    
+    # Progress history is written off the request path
+    await jobs.enqueue("goal.progress_snapshots", user_id=current_user.id, snapshots=[{"goal_id": goal_id, "snapshot": snapshot.dict()}])
+    
+    if "status" in update_data:
+        await dashboard_stats.record_goal_status_change(db, current_user.id, goal.get("status", "not_started"), update_data["status"])
+    updated = {**goal, **update_data}
+    await record_change(current_user.id, "goal", "updated", [updated])
+    
+    return Goal(**updated)
+
+MAX_BATCH_ITEMS = 100
+
+@api_router.post("/goals/bulk", response_model=GoalBatchResponse)
+async def bulk_update_goals(batch: GoalBatchRequest, current_user: User = Depends(get_current_user)):
+    """Apply progress, milestone and status changes to several goals with one bulk write"""
+    if len(batch.updates) > MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {MAX_BATCH_ITEMS} updates"
+        )
+    
+    goal_ids = {item.goal_id for item in batch.updates}
+    goals = {
+        goal["id"]: goal
+        async for goal in db.goals.find({"id": {"$in": list(goal_ids)}, "user_id": current_user.id}, {"_id": 0})
+    }
     
-    updated_goal = await db.goals.find_one({"id": goal_id, "user_id": current_user.id})
-    return Goal(**updated_goal)
+    now = datetime.utcnow()
+    results = []
+    goal_writes = []
+    # Per goal write: (index into results, history entry or None, status change or None)
+    write_effects = []
+    seen = set()
+    for item in batch.updates:
+        if item.goal_id in seen:
+            results.append(GoalBatchItemResult(goal_id=item.goal_id, success=False, error="Duplicate goal in batch"))
+            continue
+        seen.add(item.goal_id)
+        goal = goals.get(item.goal_id)
+        if goal is None:
+            results.append(GoalBatchItemResult(goal_id=item.goal_id, success=False, error="Goal not found"))
+            continue
+        
+        update_data = {"updated_at": now}
+        history_entry = None
+        if item.progress is not None:
+            update_data["progress"] = item.progress
+            new_status = progress_status(item.progress)
+            if new_status:
+                update_data["status"] = new_status
+            snapshot = GoalProgressSnapshot(date=now, progress=item.progress, notes=item.notes)
+            history_entry = {"goal_id": item.goal_id, "snapshot": snapshot.dict()}
+        if item.status is not None:
+            update_data["status"] = item.status
+        if item.milestones is not None:
+            update_data["milestones"] = [m.dict() for m in item.milestones]
+        
+        goal_writes.append(UpdateOne({"id": item.goal_id, "user_id": current_user.id}, {"$set": update_data}))
+        status_change = (goal.get("status", "not_started"), update_data["status"]) if "status" in update_data else None
+        write_effects.append((len(results), history_entry, status_change))
+        results.append(GoalBatchItemResult(goal_id=item.goal_id, success=True, goal=Goal(**{**goal, **update_data})))
+    
+    failed_writes = set()
+    missing_writes = set()
+    if goal_writes:
+        try:
+            matched = (await db.goals.bulk_write(goal_writes, ordered=False)).matched_count
+        except BulkWriteError as exc:
+            # Unordered: every other write was still applied, so only these items fail
+            failed_writes = {error["index"] for error in exc.details.get("writeErrors", [])}
+            if not failed_writes:
+                raise
+            matched = exc.details.get("nMatched", 0)
+        applied = [index for index in range(len(goal_writes)) if index not in failed_writes]
+        if matched < len(applied):
+            # Goals deleted after the ownership read matched nothing; find out which
+            write_goal_ids = {index: results[write_effects[index][0]].goal_id for index in applied}
+            remaining = {
+                goal["id"]
+                async for goal in db.goals.find({"id": {"$in": list(write_goal_ids.values())}, "user_id": current_user.id}, {"_id": 0, "id": 1})
+            }
+            missing_writes = {index for index, goal_id in write_goal_ids.items() if goal_id not in remaining}
+    
+    history_entries = []
+    status_changes = []
+    for write_index, (result_index, history_entry, status_change) in enumerate(write_effects):
+        if write_index in failed_writes or write_index in missing_writes:
+            goal_id = results[result_index].goal_id
+            error = "Goal not found" if write_index in missing_writes else "Update failed"
+            results[result_index] = GoalBatchItemResult(goal_id=goal_id, success=False, error=error)
+            continue
+        if history_entry:
+            history_entries.append(history_entry)
+        if status_change:
+            status_changes.append(status_change)
+    
+    if history_entries:
+        await jobs.enqueue("goal.progress_snapshots", user_id=current_user.id, snapshots=history_entries)
+    await dashboard_stats.record_goal_status_changes(db, current_user.id, status_changes)
+    updated = [result.goal.dict() for result in results if result.success]
+    if updated:
+        await record_change(current_user.id, "goal", "updated", updated)
+    
+    return GoalBatchResponse(results=results)
 
 @api_router.get("/goals/{goal_id}/progress-history", response_model=GoalProgressHistory)
-async def get_goal_progress_history(goal_id: str, current_user: User = Depends(get_current_user)):
+async def get_goal_progress_history(
+    goal_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    max_points: Optional[int] = Query(None, ge=2),
+    current_user: User = Depends(get_current_user),
+):
     # Verify goal belongs to user
-    goal = await db.goals.find_one({"id": goal_id, "user_id": current_user.id})
+    goal = await db.goals.find_one({"id": goal_id, "user_id": current_user.id}, {"_id": 1})
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
     
-    history = await db.goal_progress_history.find_one({"goal_id": goal_id})
-    if not history:
-        # Return empty history if none exists
-        return GoalProgressHistory(goal_id=goal_id, snapshots=[])
+    start, end = as_naive_utc(start), as_naive_utc(end)
+    
+    # Legacy single-document histories carry no date bounds, so they always match
+    conditions = [{"goal_id": goal_id}]
+    if start:
+        conditions.append({"$or": [{"last_date": {"$gte": start}}, {"last_date": {"$exists": False}}]})
+    if end:
+        conditions.append({"$or": [{"first_date": {"$lte": end}}, {"first_date": {"$exists": False}}]})
     
-    return GoalProgressHistory(**history)
+    buckets = await db.goal_progress_history.find({"$and": conditions}, {"snapshots": 1, "_id": 0}).sort("first_date", 1).to_list(None)
+    snapshots = [
+        snapshot
+        for bucket in buckets
+        for snapshot in bucket.get("snapshots", [])
+        if (not start or snapshot["date"] >= start) and (not end or snapshot["date"] <= end)
+    ]
+    snapshots.sort(key=lambda snapshot: snapshot["date"])
+    
+    if max_points:
+        snapshots = downsample(snapshots, max_points)
+    
+    return GoalProgressHistory(goal_id=goal_id, snapshots=snapshots)
 
 # Cycle Analytics Routes
+def cycle_analytics_pipeline(cycle_id: str, user_id: str):
+    """Single-round-trip aggregation that yields exactly the CycleAnalytics fields"""
+    children = {"cycle_id": cycle_id, "user_id": user_id}
+    goals_total = {"$ifNull": [{"$arrayElemAt": ["$goal_stats.total", 0]}, 0]}
+    goals_completed = {"$ifNull": [{"$arrayElemAt": ["$goal_stats.completed", 0]}, 0]}
+    reflection_count = {"$ifNull": [{"$arrayElemAt": ["$reflection_stats.count", 0]}, 0]}
+    mood_total = {"$ifNull": [{"$arrayElemAt": ["$reflection_stats.mood_total", 0]}, 0]}
+    return [
+        {"$match": {"id": cycle_id, "user_id": user_id}},
+        {"$limit": 1},
+        {"$lookup": {
+            "from": "goals",
+            "pipeline": [
+                {"$match": children},
+                {"$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "completed": {"$sum": {"$cond": [{"$eq": ["$status", "completed"]}, 1, 0]}},
+                }},
+            ],
+            "as": "goal_stats",
+        }},
+        {"$lookup": {
+            "from": "reflections",
+            "pipeline": [
+                {"$match": children},
+                {"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "mood_total": {"$sum": {"$ifNull": ["$mood_rating", 5]}},
+                    "manifestation_count": {"$sum": {"$size": {"$ifNull": ["$law_of_attraction_manifestations", []]}}},
+                }},
+            ],
+            "as": "reflection_stats",
+        }},
+        {"$project": {
+            "_id": 0,
+            "cycle_id": "$id",
+            "goals_total": goals_total,
+            "goals_completed": goals_completed,
+            "completion_rate": {"$cond": [
+                {"$gt": [goals_total, 0]},
+                {"$multiply": [{"$divide": [goals_completed, goals_total]}, 100]},
+                0,
+            ]},
+            "average_mood": {"$cond": [{"$gt": [reflection_count, 0]}, {"$divide": [mood_total, reflection_count]}, 5]},
+            "manifestation_count": {"$ifNull": [{"$arrayElemAt": ["$reflection_stats.manifestation_count", 0]}, 0]},
+            "start_date": "$start_date",
+            "end_date": "$end_date",
+            "status": "$status",
+        }},
+    ]
+
+def build_cycle_analytics(result: dict) -> CycleAnalytics:
+    """CycleAnalytics from a cycle_analytics_pipeline result, with the week fields derived now"""
+    cycle = annotate_cycle(result)
+    return CycleAnalytics(**cycle, weeks_completed=weeks_completed(cycle))
+
 @api_router.get("/cycles/{cycle_id}/analytics", response_model=CycleAnalytics)
 async def get_cycle_analytics(cycle_id: str, current_user: User = Depends(get_current_user)):
-    cycle = await db.cycles.find_one({"id": cycle_id, "user_id": current_user.id})
-    if not cycle:
+    results = await db.cycles.aggregate(cycle_analytics_pipeline(cycle_id, current_user.id)).to_list(1)
+    if not results:
         raise HTTPException(status_code=404, detail="Cycle not found")
     
-    # Get cycle goals
-    goals = await db.goals.find({"cycle_id": cycle_id, "user_id": current_user.id}, {"status": 1, "progress": 1, "_id": 0}).to_list(100)
-    goals_total = len(goals)
-    goals_completed = len([g for g in goals if g.get("status") == "completed"])
-    completion_rate = (goals_completed / goals_total * 100) if goals_total > 0 else 0
-    
-    # Get reflections for average mood
-    reflections = await db.reflections.find({"cycle_id": cycle_id, "user_id": current_user.id}, {"mood_rating": 1, "law_of_attraction_manifestations": 1, "_id": 0}).to_list(100)
-    average_mood = sum([r.get("mood_rating", 5) for r in reflections]) / len(reflections) if reflections else 5
-    
-    # Count manifestations
-    manifestation_count = sum([len(r.get("law_of_attraction_manifestations", [])) for r in reflections])
-    
-    analytics = CycleAnalytics(
-        cycle_id=cycle_id,
-        completion_rate=completion_rate,
-        goals_completed=goals_completed,
-        goals_total=goals_total,
-        average_mood=average_mood,
-        manifestation_count=manifestation_count,
-        weeks_completed=cycle["current_week"] - 1,
-        start_date=cycle["start_date"],
-        current_week=cycle["current_week"]
-    )
-    
-    return analytics
+    return build_cycle_analytics(results[0])
 
 @api_router.post("/cycles/{cycle_id}/complete", response_model=Cycle)
 async def complete_cycle(cycle_id: str, completion_data: CycleComplete, current_user: User = Depends(get_current_user)):
-    cycle = await db.cycles.find_one({"id": cycle_id, "user_id": current_user.id})
-    if not cycle:
-        raise HTTPException(status_code=404, detail="Cycle not found")
-    
     update_data = {
         "status": "completed",
-        "current_week": 12,
         "completion_notes": completion_data.completion_notes,
         "success_story": completion_data.success_story,
         "overall_satisfaction": completion_data.overall_satisfaction,
@@ -670,51 +1226,158 @@ async def complete_cycle(cycle_id: str, completion_data: CycleComplete, current_
         "updated_at": datetime.utcnow()
     }
     
-    await db.cycles.update_one(
+    cycle = await db.cycles.find_one_and_update(
         {"id": cycle_id, "user_id": current_user.id},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE
     )
+    if not cycle:
+        raise HTTPException(status_code=404, detail="Cycle not found")
+    cycle_cache.invalidate((current_user.id, cycle_id))
+    await dashboard_stats.record_cycle_status_change(db, current_user.id, cycle.get("status", "active"), "completed")
+    updated = annotate_cycle({**cycle, **update_data})
+    await record_change(current_user.id, "cycle", "completed", [updated])
     
-    completed_cycle = await db.cycles.find_one({"id": cycle_id, "user_id": current_user.id})
-    return Cycle(**completed_cycle)
+    return Cycle(**updated)
 
 # Dashboard Analytics
 @api_router.get("/analytics/dashboard", response_model=DashboardAnalytics)
-async def get_dashboard_analytics(current_user: User = Depends(get_current_user)):
-    # Get user cycles and goals
-    cycles = await db.cycles.find({"user_id": current_user.id}, {"status": 1, "_id": 0}).to_list(100)
-    goals = await db.goals.find({"user_id": current_user.id}, {"status": 1, "progress": 1, "_id": 0}).to_list(100)
-    reflections = await db.reflections.find({"user_id": current_user.id}, {"law_of_attraction_manifestations": 1, "mood_rating": 1, "_id": 0}).sort("created_at", -1).limit(10).to_list(10)
-    
-    total_cycles = len(cycles)
-    active_cycles = len([c for c in cycles if c.get("status") == "active"])
-    completed_cycles = len([c for c in cycles if c.get("status") == "completed"])
-    
-    total_goals = len(goals)
-    completed_goals = len([g for g in goals if g.get("status") == "completed"])
-    average_completion_rate = (completed_goals / total_goals * 100) if total_goals > 0 else 0
-    
-    # Recent manifestations from last 5 reflections
-    recent_manifestations = []
-    for reflection in reflections[:5]:
-        manifestations = reflection.get("law_of_attraction_manifestations", [])
-        recent_manifestations.extend(manifestations[:2])  # Take up to 2 per reflection
-    
-    # Mood trend from recent reflections
-    mood_trend = [r.get("mood_rating", 5) for r in reflections]
-    
-    analytics = DashboardAnalytics(
-        total_cycles=total_cycles,
-        active_cycles=active_cycles,
-        completed_cycles=completed_cycles,
-        total_goals=total_goals,
-        completed_goals=completed_goals,
-        average_completion_rate=average_completion_rate,
-        recent_manifestations=recent_manifestations[:10],
-        mood_trend=mood_trend[:10]
+async def get_dashboard_analytics(request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    cached = await not_modified(db, request, response, current_user.id)
+    if cached:
+        return cached
+    
+    stats = await dashboard_stats.load_dashboard_stats(db, current_user.id)
+    return DashboardAnalytics(**dashboard_stats.dashboard_analytics_fields(stats))
+
+# Change Feed
+@api_router.get("/sync", response_model=SyncResponse)
+async def sync_changes(since: Optional[str] = None, current_user: User = Depends(get_current_user)):
+    """Cycles, goals, reflections, progress snapshots and deletions since the ``since`` token"""
+    changes = await sync.load_changes(db, current_user.id, since)
+    annotate_cycles(changes["cycles"])
+    if FAST_JSON:
+        for key, model_cls in (
+            ("cycles", Cycle), ("goals", Goal), ("reflections", WeeklyReflection),
+            ("progress_snapshots", SyncProgressSnapshot), ("tombstones", Tombstone),
+        ):
+            changes[key] = [trusted_dump(model_cls, doc) for doc in changes[key]]
+        return ORJSONResponse(changes)
+    return SyncResponse(**changes)
+
+# Push Events
+# EventSource cannot set headers, so browsers open the stream with ?ticket=. A ticket is a
+# short-lived token that only opens event streams; URLs end up in access logs, so the
+# access token itself never goes in one
+EVENT_TICKET_TTL_SECONDS = int(os.environ.get('EVENT_TICKET_TTL_SECONDS', '30'))
+EVENT_TICKET_SCOPE = "events"
+
+stream_security = HTTPBearer(auto_error=False)
+
+class EventTicket(BaseModel):
+    ticket: str
+    expires_in: int
+
+@api_router.post("/events/ticket", response_model=EventTicket)
+async def create_event_ticket(current_user: User = Depends(get_current_user)):
+    ticket = create_access_token(
+        {"sub": current_user.id, "scope": EVENT_TICKET_SCOPE},
+        expires_delta=timedelta(seconds=EVENT_TICKET_TTL_SECONDS),
     )
+    return EventTicket(ticket=ticket, expires_in=EVENT_TICKET_TTL_SECONDS)
+
+def event_ticket_user_id(ticket: str) -> str:
+    try:
+        payload = jwt.decode(ticket, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        payload = {}
+    if payload.get("scope") != EVENT_TICKET_SCOPE or payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired event ticket",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload["sub"]
+
+@api_router.get("/events")
+async def event_stream(ticket: Optional[str] = None, credentials: Optional[HTTPAuthorizationCredentials] = Depends(stream_security)):
+    """Server-sent events for the current user's cycles, goals and reflections, opened with
+    the access token in the Authorization header or a ticket from POST /events/ticket"""
+    if credentials is not None:
+        with timed_phase("auth"):
+            user_id = (await authenticate_credentials(credentials)).id
+    elif ticket:
+        user_id = event_ticket_user_id(ticket)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    return analytics
+    try:
+        subscription = events.broker.subscribe(user_id)
+    except events.TooManyConnections:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many open event streams")
+    
+    return StreamingResponse(
+        events.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Operational Stats
+# /api/internal/stats and /metrics expose cache, pool and per-route details, so they
+# are disabled unless INTERNAL_STATS_TOKEN is set and then require it as a bearer token
+INTERNAL_STATS_TOKEN = os.environ.get('INTERNAL_STATS_TOKEN', '')
+internal_security = HTTPBearer(auto_error=False)
+
+async def require_internal_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(internal_security)):
+    if not INTERNAL_STATS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), INTERNAL_STATS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@api_router.get("/internal/stats", dependencies=[Depends(require_internal_token)])
+async def get_internal_stats():
+    return {
+        "cold_start": cold_start_timings,
+        "mongo": mongo_metrics.snapshot(),
+        "user_cache": user_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "cycle_cache": cycle_cache.stats(),
+        "jobs": jobs.runner.stats(),
+        "password_pool": {
+            "workers": PASSWORD_HASH_WORKERS,
+            "queue_limit": PASSWORD_HASH_QUEUE_LIMIT,
+            "pending": password_tasks_pending,
+            "bcrypt_rounds": bcrypt_rounds,
+        },
+    }
+
+# Prometheus-style metrics
+user_cache_lookups = metrics.Counter("user_cache_lookups_total", "Authenticated-user cache lookups", ["result"])
+user_cache_entries = metrics.Gauge("user_cache_entries", "Authenticated users currently cached")
+token_cache_lookups = metrics.Counter("token_cache_lookups_total", "Verified-token cache lookups", ["result"])
+token_cache_entries = metrics.Gauge("token_cache_entries", "Verified tokens currently cached")
+password_tasks_gauge = metrics.Gauge("password_hash_tasks_pending", "Password hashing calls queued or running")
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_internal_token)])
+async def get_metrics():
+    cache_stats = user_cache.stats()
+    user_cache_lookups.set_total(cache_stats["hits"], result="hit")
+    user_cache_lookups.set_total(cache_stats["misses"], result="miss")
+    user_cache_entries.set(cache_stats["size"])
+    cache_stats = token_cache.stats()
+    token_cache_lookups.set_total(cache_stats["hits"], result="hit")
+    token_cache_lookups.set_total(cache_stats["misses"], result="miss")
+    token_cache_entries.set(cache_stats["size"])
+    password_tasks_gauge.set(password_tasks_pending)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 # Legacy Models
 class StatusCheck(BaseModel):
@@ -737,10 +1400,20 @@ async def create_status_check(input: StatusCheckCreate):
     _ = await db.status_checks.insert_one(status_obj.dict())
     return status_obj
 
+STATUS_CHECK_SORT_FIELDS = ("timestamp", "id")
+
 @api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find({}, {"_id": 0}).to_list(100)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+async def get_status_checks(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = False,
+):
+    if stream:
+        return stream_models(db.status_checks, {}, STATUS_CHECK_SORT_FIELDS, cursor, StatusCheck, response)
+    
+    status_checks = await fetch_page(db.status_checks, {}, STATUS_CHECK_SORT_FIELDS, cursor, limit, response)
+    return model_list_response(StatusCheck, status_checks, response)
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -751,8 +1424,34 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+# Cold start timings: module import and the first request served by this process
+cold_start_timings = {"import_ms": None, "first_request_ms": None}
+
+class FirstRequestTimer:
+    """Pure ASGI middleware that times the first HTTP request, then gets out of the way"""
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or cold_start_timings["first_request_ms"] is not None:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if cold_start_timings["first_request_ms"] is None:
+                cold_start_timings["first_request_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                logger.info("Cold start: import %.1f ms, first request %.1f ms", cold_start_timings["import_ms"], cold_start_timings["first_request_ms"])
+
+app.add_middleware(FirstRequestTimer)
+app.add_middleware(RequestMetricsMiddleware)
+if QUERY_PROFILING:
+    app.add_middleware(QueryProfilerMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -760,9 +1459,87 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ENSURE_INDEXES = os.environ.get('ENSURE_INDEXES', 'true').lower() in ('1', 'true', 'yes')
+
+@app.on_event("startup")
+async def bootstrap_indexes():
+    if not ENSURE_INDEXES:
+        return
+    from indexes import ensure_indexes
+    try:
+        await ensure_indexes(db)
+    except Exception:
+        logger.exception("Index bootstrap failed; continuing without it")
+
+# Background jobs (see jobs.py); handlers may run more than once, so keep repeats harmless
+TOKEN_CLEANUP_INTERVAL_SECONDS = float(os.environ.get('TOKEN_CLEANUP_INTERVAL_SECONDS', '3600'))
+
+@jobs.register("goal.progress_snapshots")
+async def write_progress_snapshots(user_id: str, snapshots: List[dict]):
+    """Append {"goal_id", "snapshot"} entries to the goals' history buckets; ordered so
+    repeated snapshots for a bucket fill it in sequence. Snapshots a failed earlier
+    attempt already stored are skipped, so a retry never records one twice"""
+    snapshots = [{"goal_id": entry["goal_id"], "snapshot": GoalProgressSnapshot(**entry["snapshot"])} for entry in snapshots]
+    stored = set()
+    async for bucket in db.goal_progress_history.find(
+        {
+            "goal_id": {"$in": list({entry["goal_id"] for entry in snapshots})},
+            "snapshots.id": {"$in": [entry["snapshot"].id for entry in snapshots]},
+        },
+        {"snapshots.id": 1, "_id": 0},
+    ):
+        stored.update(snapshot.get("id") for snapshot in bucket["snapshots"])
+    written_at = datetime.utcnow()
+    writes = [
+        UpdateOne(*progress_snapshot_update(entry["goal_id"], user_id, entry["snapshot"], written_at), upsert=True)
+        for entry in snapshots
+        if entry["snapshot"].id not in stored
+    ]
+    if writes:
+        await db.goal_progress_history.bulk_write(writes)
+
+@jobs.register("cycle.analytics")
+async def publish_cycle_analytics(user_id: str, cycle_ids: List[str]):
+    if not events.broker.has_subscribers(user_id):
+        return
+    for cycle_id in cycle_ids:
+        results = await db.cycles.aggregate(cycle_analytics_pipeline(cycle_id, user_id)).to_list(1)
+        if results:
+            events.publish(user_id, "cycle.analytics", build_cycle_analytics(results[0]).dict(), cycle_id)
+
+@jobs.register("tokens.cleanup")
+async def remove_spent_tokens():
+    """Delete used or expired reset tokens and expired refresh tokens. The TTL indexes
+    cover expiry where ensure_indexes has run, but used reset tokens would otherwise stay"""
+    now = datetime.utcnow()
+    await db.password_reset_tokens.delete_many({"$or": [{"used": True}, {"expires_at": {"$lte": now}}]})
+    await db.refresh_tokens.delete_many({"expires_at": {"$lte": now}})
+
+async def on_cycles_completed(user_id: str, cycles: List[dict]):
+    for cycle in cycles:
+        cycle_cache.invalidate((user_id, cycle["id"]))
+    await record_change(user_id, "cycle", "completed", annotate_cycles(cycles))
+
+@jobs.register("cycles.complete_overdue")
+async def complete_overdue_cycles_job():
+    completed = await complete_overdue_cycles(db, on_cycles_completed)
+    if completed:
+        logger.info("Completed %d overdue cycle(s)", completed)
+
+@app.on_event("startup")
+async def start_background_jobs():
+    jobs.runner.start()
+    jobs.runner.every(CYCLE_ROLLOVER_INTERVAL_SECONDS, "cycles.complete_overdue")
+    jobs.runner.every(TOKEN_CLEANUP_INTERVAL_SECONDS, "tokens.cleanup")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    # Queued jobs still need the database
+    await jobs.runner.drain()
+    close_client()
+    password_executor.shutdown(wait=False)
 
 # Mangum handler for AWS Lambda / Serverless deployment
 handler = Mangum(app, lifespan="off")
+
+cold_start_timings["import_ms"] = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)
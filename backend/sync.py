@@ -0,0 +1,105 @@
+"""Per-user change feed behind GET /api/sync.
+
+A client keeps the opaque token returned by its last sync and sends it back as
+``since``. The response holds only what changed after that checkpoint:
+
+* cycles and goals whose ``updated_at`` is later (every write path sets it)
+* reflections created later (reflections are never edited)
+* progress snapshots stored later, read from the history buckets whose
+  ``written_at`` is later. Snapshots are dated when progress is reported but
+  stored by a background job, so their ``date`` can fall before a checkpoint
+  taken in between; snapshots stored before ``written_at`` existed fall back
+  to ``date``
+* tombstones for deleted documents, kept in ``deleted_documents`` for
+  TOMBSTONE_RETENTION_DAYS by a TTL index
+
+Without a token, or with one older than the tombstone retention, the
+response is a full snapshot with ``full_resync`` set and the client replaces
+its local state. Progress snapshots are only sent as deltas; a full resync
+leaves charts to the progress-history endpoint.
+
+The next token is taken SYNC_OVERLAP_SECONDS before the sync started so
+writes that were in flight while it ran are not skipped. Clients therefore
+upsert what they receive by ``id`` (and snapshots by goal and date).
+"""
+import base64
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from timeutils import as_naive_utc
+
+SYNC_OVERLAP_SECONDS = float(os.environ.get('SYNC_OVERLAP_SECONDS', '5'))
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS', '30'))
+
+TOMBSTONES = "deleted_documents"
+
+
+def encode_sync_token(checkpoint: datetime) -> str:
+    raw = json.dumps({"t": checkpoint.isoformat()}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> datetime:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        checkpoint = datetime.fromisoformat(json.loads(base64.urlsafe_b64decode(padded.encode()))["t"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token")
+    # Stored dates are naive UTC; a token carrying an offset would not compare with them
+    return as_naive_utc(checkpoint)
+
+
+async def record_tombstone(db, user_id: str, collection: str, doc_id: str):
+    """Call from any path that deletes a user's cycle, goal or reflection"""
+    await db[TOMBSTONES].insert_one({
+        "user_id": user_id,
+        "collection": collection,
+        "id": doc_id,
+        "deleted_at": datetime.utcnow(),
+    })
+
+
+async def load_changes(db, user_id: str, token: Optional[str]) -> dict:
+    started = datetime.utcnow()
+    since = decode_sync_token(token) if token else None
+    full_resync = since is None or since < started - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+
+    def changed(field: str) -> dict:
+        query = {"user_id": user_id}
+        if not full_resync:
+            query[field] = {"$gt": since}
+        return query
+
+    projection = {"_id": 0}
+    changes = {
+        "cycles": await db.cycles.find(changed("updated_at"), projection).to_list(None),
+        "goals": await db.goals.find(changed("updated_at"), projection).to_list(None),
+        "reflections": await db.reflections.find(changed("created_at"), projection).to_list(None),
+        "progress_snapshots": [],
+        "tombstones": [],
+        "full_resync": full_resync,
+        "next_token": encode_sync_token(started - timedelta(seconds=SYNC_OVERLAP_SECONDS)),
+    }
+    if full_resync:
+        return changes
+
+    buckets = await db.goal_progress_history.find(
+        {"user_id": user_id, "written_at": {"$gt": since}}, {"_id": 0, "goal_id": 1, "snapshots": 1}
+    ).to_list(None)
+    changes["progress_snapshots"] = sorted(
+        (
+            dict(snapshot, goal_id=bucket["goal_id"])
+            for bucket in buckets
+            for snapshot in bucket.get("snapshots", [])
+            if snapshot.get("written_at", snapshot["date"]) > since
+        ),
+        key=lambda snapshot: snapshot["date"],
+    )
+    changes["tombstones"] = await db[TOMBSTONES].find(
+        {"user_id": user_id, "deleted_at": {"$gt": since}}, {"_id": 0, "user_id": 0}
+    ).to_list(None)
+    return changes
@@ -0,0 +1,23 @@
+"""Datetime helpers shared by the API and its background modules.
+
+MongoDB returns naive datetimes that are implicitly UTC, and every stored date
+is written that way. Values parsed from clients may carry an offset and must
+be normalised before they are compared with stored ones.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalise client-supplied datetimes to the naive UTC values stored in MongoDB"""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def as_stored(value: Optional[datetime]) -> Optional[datetime]:
+    """The value MongoDB hands back for ``value``: naive UTC with millisecond precision"""
+    value = as_naive_utc(value)
+    if value is not None:
+        value = value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
@@ -11,6 +11,11 @@ export const authApi = {
     return response.data;
   },
 
+  logout: async (refreshToken) => {
+    const response = await apiClient.post('/auth/logout', { refresh_token: refreshToken });
+    return response.data;
+  },
+
   getCurrentUser: async () => {
     const response = await apiClient.get('/auth/me');
     return response.data;
@@ -22,17 +22,90 @@ apiClient.interceptors.request.use(
   }
 );
 
+// Save a token response; one without a refresh token must not leave an older
+// refresh token behind to be replayed against a different session
+export const storeTokens = (data) => {
+  localStorage.setItem('token', data.access_token);
+  if (data.refresh_token) {
+    localStorage.setItem('refresh_token', data.refresh_token);
+  } else {
+    localStorage.removeItem('refresh_token');
+  }
+};
+
+// Access tokens are short-lived; on a 401 the refresh token is exchanged for a new pair
+// once (shared by concurrent requests) and the failed request is retried
+let refreshPromise = null;
+
+const refreshTokens = () => {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem('refresh_token');
+    refreshPromise = axios
+      .post(`${apiClient.defaults.baseURL}/auth/refresh`, { refresh_token: refreshToken })
+      .then(({ data }) => {
+        storeTokens(data);
+        return data.access_token;
+      })
+      .catch((error) => {
+        // Another tab may have rotated the refresh token first
+        if (localStorage.getItem('refresh_token') !== refreshToken) {
+          return localStorage.getItem('token');
+        }
+        throw error;
+      })
+      .finally(() => {
+        refreshPromise = null;
+      });
+  }
+  return refreshPromise;
+};
+
+const clearSession = () => {
+  localStorage.removeItem('token');
+  localStorage.removeItem('refresh_token');
+  window.location.href = '/login';
+};
+
 // Response interceptor for error handling
 apiClient.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const request = error.config;
     if (error.response?.status === 401) {
+      // Credential endpoints (login, refresh, ...) fail for reasons a refresh cannot fix
+      const isCredentialCall = request?.url?.startsWith('/auth/') && request.url !== '/auth/me';
+      if (!isCredentialCall && !request._retried && localStorage.getItem('refresh_token')) {
+        request._retried = true;
+        try {
+          const token = await refreshTokens();
+          request.headers.Authorization = `Bearer ${token}`;
+          return apiClient(request);
+        } catch {
+          // Fall through to clearing the session
+        }
+      }
       // Token expired or invalid - clear auth state
-      localStorage.removeItem('token');
-      window.location.href = '/login';
+      clearSession();
     }
     return Promise.reject(error);
   }
 );
 
+// List endpoints return one page at a time and advertise the next page in X-Next-Cursor;
+// follow it until the last page so callers get the complete list
+const PAGE_SIZE = 500;
+
+export const getAllPages = async (url, params = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const response = await apiClient.get(url, {
+      params: { ...params, limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+    });
+    items.push(...response.data);
+    cursor = response.headers['x-next-cursor'] || null;
+  } while (cursor);
+  return items;
+};
+
 export default apiClient;
@@ -1,10 +1,9 @@
-import apiClient from './client';
+import apiClient, { getAllPages } from './client';
 
 export const cyclesApi = {
   // Get all cycles for current user
   getCycles: async () => {
-    const response = await apiClient.get('/cycles');
-    return response.data;
+    return getAllPages('/cycles');
   },
 
   // Get single cycle by ID
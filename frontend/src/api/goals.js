@@ -1,11 +1,10 @@
-import apiClient from './client';
+import apiClient, { getAllPages } from './client';
 
 export const goalsApi = {
   // Get all goals (optionally filtered by cycle)
   getGoals: async (cycleId) => {
     const params = cycleId ? { cycle_id: cycleId } : {};
-    const response = await apiClient.get('/goals', { params });
-    return response.data;
+    return getAllPages('/goals', params);
   },
 
   // Get single goal by ID
@@ -4,4 +4,4 @@ export { cyclesApi } from './cycles';
 export { goalsApi } from './goals';
 export { reflectionsApi } from './reflections';
 export { analyticsApi } from './analytics';
-export { default as apiClient } from './client';
+export { default as apiClient, storeTokens } from './client';
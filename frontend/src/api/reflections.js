@@ -1,11 +1,10 @@
-import apiClient from './client';
+import apiClient, { getAllPages } from './client';
 
 export const reflectionsApi = {
   // Get all reflections (optionally filtered by cycle)
   getReflections: async (cycleId) => {
     const params = cycleId ? { cycle_id: cycleId } : {};
-    const response = await apiClient.get('/reflections', { params });
-    return response.data;
+    return getAllPages('/reflections', params);
   },
 
   // Get single reflection by ID
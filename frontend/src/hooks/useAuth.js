@@ -1,5 +1,5 @@
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
-import { authApi } from '../api';
+import { authApi, storeTokens } from '../api';
 
 // Query keys
 export const authKeys = {
@@ -24,7 +24,7 @@ export const useRegister = () => {
   return useMutation({
     mutationFn: authApi.register,
     onSuccess: (data) => {
-      localStorage.setItem('token', data.access_token);
+      storeTokens(data);
       queryClient.setQueryData(authKeys.user(), data.user);
     },
   });
@@ -37,7 +37,7 @@ export const useLogin = () => {
   return useMutation({
     mutationFn: authApi.login,
     onSuccess: (data) => {
-      localStorage.setItem('token', data.access_token);
+      storeTokens(data);
       queryClient.setQueryData(authKeys.user(), data.user);
     },
   });
@@ -48,7 +48,13 @@ export const useLogout = () => {
   const queryClient = useQueryClient();
   
   return () => {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (refreshToken) {
+      // Revoke the session server-side; logging out locally must not wait for it
+      authApi.logout(refreshToken).catch(() => {});
+    }
     localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
     queryClient.setQueryData(authKeys.user(), null);
     queryClient.clear();
   };
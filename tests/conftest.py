@@ -0,0 +1,45 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'manifest12_test')
+os.environ.setdefault('SECRET_KEY', 'test-secret-key-that-is-long-enough-for-hs256')
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+os.environ.setdefault('ENSURE_INDEXES', 'false')
+
+
+@pytest.fixture
+def client():
+    """API client over a fresh mongomock-motor database, without lifespan events (jobs run inline)"""
+    from fastapi.testclient import TestClient
+    from mongomock_motor import AsyncMongoMockClient
+
+    import database
+    import server
+
+    database.configure_database(AsyncMongoMockClient()[os.environ['DB_NAME']])
+    for cache in (server.user_cache, server.token_cache, server.token_revocations, server.cycle_cache):
+        cache.clear()
+    yield TestClient(server.app)
+    database.configure_database(None)
+
+
+class AuthHeaders(dict):
+    user_id: str
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Headers for a freshly registered user; the user's id is in ``auth_headers.user_id``"""
+    response = client.post("/api/auth/register", json={"email": "lee@example.com", "password": "password", "full_name": "Lee"})
+    assert response.status_code == 200, response.text
+    headers = AuthHeaders(Authorization=f"Bearer {response.json()['access_token']}")
+    headers.user_id = response.json()["user"]["id"]
+    return headers
@@ -0,0 +1,105 @@
+import refresh_tokens
+
+EMAIL = "casey@example.com"
+PASSWORD = "first-password"
+
+
+def register(client, email=EMAIL, password=PASSWORD):
+    response = client.post("/api/auth/register", json={"email": email, "password": password, "full_name": "Casey"})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def refresh(client, refresh_token):
+    return client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def me(client, access_token):
+    return client.get("/api/auth/me", headers={"Authorization": f"Bearer {access_token}"})
+
+
+def test_refresh_rotates_the_token_pair(client):
+    tokens = register(client)
+
+    response = refresh(client, tokens["refresh_token"])
+
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert me(client, rotated["access_token"]).status_code == 200
+
+
+def test_reusing_a_refresh_token_revokes_the_family(client, monkeypatch):
+    monkeypatch.setattr(refresh_tokens, "REFRESH_REUSE_GRACE_SECONDS", 0)
+    tokens = register(client)
+    rotated = refresh(client, tokens["refresh_token"]).json()
+
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    # The legitimate holder's current token went down with the family
+    assert refresh(client, rotated["refresh_token"]).status_code == 401
+
+
+def test_reuse_within_the_grace_window_keeps_the_family(client):
+    tokens = register(client)
+    rotated = refresh(client, tokens["refresh_token"]).json()
+
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    assert refresh(client, rotated["refresh_token"]).status_code == 200
+
+
+def test_logout_revokes_the_refresh_token(client):
+    tokens = register(client)
+
+    assert client.post("/api/auth/logout", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+
+
+def test_logout_leaves_other_sessions_alone(client):
+    tokens = register(client)
+    other = client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD}).json()
+
+    client.post("/api/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+
+    assert refresh(client, other["refresh_token"]).status_code == 200
+
+
+def test_password_reset_invalidates_existing_tokens(client):
+    tokens = register(client)
+    reset_token = client.post("/api/auth/forgot-password", json={"email": EMAIL}).json()["reset_token"]
+
+    response = client.post("/api/auth/reset-password", json={"token": reset_token, "new_password": "second-password"})
+
+    assert response.status_code == 200
+    assert me(client, tokens["access_token"]).status_code == 401
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    login = client.post("/api/auth/login", json={"email": EMAIL, "password": "second-password"})
+    assert login.status_code == 200
+    assert me(client, login.json()["access_token"]).status_code == 200
+
+
+def test_unknown_refresh_token_is_rejected(client):
+    register(client)
+
+    assert refresh(client, "not-a-real-token").status_code == 401
+
+
+def reset_password(client, email, new_password):
+    reset_token = client.post("/api/auth/forgot-password", json={"email": email}).json()["reset_token"]
+    response = client.post("/api/auth/reset-password", json={"token": reset_token, "new_password": new_password})
+    assert response.status_code == 200
+
+
+def test_reset_revocation_survives_eviction(client, monkeypatch):
+    import server
+    from cache import TTLCache
+
+    monkeypatch.setattr(server, "token_revocations", TTLCache(maxsize=1, ttl=server.token_revocations.ttl))
+    tokens = register(client)
+    register(client, email="other@example.com")
+
+    reset_password(client, EMAIL, "second-password")
+    # Pushes the first user's revocation out of the one-entry map
+    reset_password(client, "other@example.com", "second-password")
+
+    assert me(client, tokens["access_token"]).status_code == 401
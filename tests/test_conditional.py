@@ -0,0 +1,86 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+from conditional import etag_matches
+
+CYCLE = {"title": "Cycle", "description": "Twelve weeks", "law_of_attraction_statement": "It is done"}
+GOAL = {"title": "Goal", "description": "Outcome", "category": "health", "why_statement": "Why", "visualization_note": "Seen"}
+REFLECTION = {"progress_review": "Good", "neville_goddard_practice": "SATS", "challenges": "None", "insights": "Some", "week_number": 1}
+
+READ_PATHS = ["/api/cycles", "/api/goals", "/api/reflections", "/api/analytics/dashboard"]
+
+
+@pytest.fixture
+def seeded(client, auth_headers):
+    cycle = client.post("/api/cycles", headers=auth_headers, json=CYCLE).json()
+    overdue_start = (datetime.utcnow() - timedelta(weeks=13)).isoformat()
+    client.post("/api/cycles", headers=auth_headers, json=dict(CYCLE, start_date=overdue_start))
+    goal = client.post("/api/goals", headers=auth_headers, json=dict(GOAL, cycle_id=cycle["id"])).json()
+    return {"cycle_id": cycle["id"], "goal_id": goal["id"]}
+
+
+@pytest.mark.parametrize("path", READ_PATHS)
+def test_repeat_get_with_matching_etag_is_not_modified(client, auth_headers, seeded, path):
+    first = client.get(path, headers=auth_headers)
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    repeat = client.get(path, headers=dict(auth_headers, **{"If-None-Match": first.headers["ETag"]}))
+
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["ETag"] == first.headers["ETag"]
+
+
+def test_etag_depends_on_the_query(client, auth_headers, seeded):
+    everything = client.get("/api/goals", headers=auth_headers).headers["ETag"]
+    one_cycle = client.get("/api/goals", params={"cycle_id": seeded["cycle_id"]}, headers=auth_headers).headers["ETag"]
+
+    assert everything != one_cycle
+
+
+WRITES = {
+    "goal progress": lambda client, headers, ids: client.post(f"/api/goals/{ids['goal_id']}/progress", headers=headers, json={"progress": 30}),
+    "bulk goal update": lambda client, headers, ids: client.post("/api/goals/bulk", headers=headers, json={"updates": [{"goal_id": ids["goal_id"], "progress": 60}]}),
+    "goal update": lambda client, headers, ids: client.put(f"/api/goals/{ids['goal_id']}", headers=headers, json={"status": "on_hold"}),
+    "reflection": lambda client, headers, ids: client.post("/api/reflections", headers=headers, json=dict(REFLECTION, cycle_id=ids["cycle_id"])),
+    "cycle update": lambda client, headers, ids: client.put(f"/api/cycles/{ids['cycle_id']}", headers=headers, json={"status": "paused"}),
+    "overdue cycle job": lambda client, headers, ids: asyncio.run(server.complete_overdue_cycles_job()),
+}
+
+
+@pytest.mark.parametrize("write", WRITES.values(), ids=WRITES.keys())
+@pytest.mark.parametrize("path", READ_PATHS)
+def test_any_write_changes_the_etag(client, auth_headers, seeded, path, write):
+    before = client.get(path, headers=auth_headers).headers["ETag"]
+
+    response = write(client, auth_headers, seeded)
+    assert response is None or response.status_code == 200, response.text
+
+    after = client.get(path, headers=dict(auth_headers, **{"If-None-Match": before}))
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before
+
+
+def test_etags_are_per_user(client, auth_headers, seeded):
+    mine = client.get("/api/cycles", headers=auth_headers).headers["ETag"]
+    other = client.post("/api/auth/register", json={"email": "other@example.com", "password": "password", "full_name": "O"}).json()
+
+    response = client.get("/api/cycles", headers={"Authorization": f"Bearer {other['access_token']}", "If-None-Match": mine})
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('W/"xyz", W/"abc"', True),
+    ("*", True),
+    ('W/"xyz"', False),
+    ("", False),
+])
+def test_etag_matching_is_weak(header, matches):
+    assert etag_matches(header, 'W/"abc"') is matches
@@ -0,0 +1,27 @@
+import server
+
+CYCLE = {"title": "Spring", "description": "Twelve weeks", "law_of_attraction_statement": "It is done"}
+REFLECTION = {"progress_review": "Good", "neville_goddard_practice": "SATS", "challenges": "None", "insights": "Some"}
+
+
+def auth(client):
+    response = client.post("/api/auth/register", json={"email": "sam@example.com", "password": "password", "full_name": "Sam"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def create_reflection(client, headers, cycle_id, week_number):
+    response = client.post("/api/reflections", headers=headers, json=dict(REFLECTION, cycle_id=cycle_id, week_number=week_number))
+    assert response.status_code == 200, response.text
+    return response.json()["week_start_date"]
+
+
+def test_week_start_date_does_not_depend_on_the_cycle_cache(client):
+    headers = auth(client)
+    start_date = "2026-03-02T10:15:03.072378+02:00"
+    cycle_id = client.post("/api/cycles", headers=headers, json=dict(CYCLE, start_date=start_date)).json()["id"]
+
+    from_cache = create_reflection(client, headers, cycle_id, 2)
+    server.cycle_cache.clear()
+    from_database = create_reflection(client, headers, cycle_id, 2)
+
+    assert from_cache == from_database == "2026-03-09T08:15:03.072000"
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+from cycle_schedule import CYCLE_WEEKS, annotate_cycle, annotate_cycles
+
+NOW = datetime(2026, 6, 15, 9, 0)
+
+
+def cycle(start_date, status="active"):
+    return {"id": "c1", "status": status, "start_date": start_date, "end_date": start_date + timedelta(weeks=CYCLE_WEEKS)}
+
+
+def test_active_cycle_counts_weeks_and_days_from_today():
+    annotated = annotate_cycle(cycle(NOW - timedelta(days=10)), NOW)
+
+    assert annotated["current_week"] == 2
+    assert annotated["days_remaining"] == CYCLE_WEEKS * 7 - 10
+
+
+def test_weeks_calendar_follows_the_start_date():
+    start = NOW - timedelta(days=10)
+
+    weeks = annotate_cycle(cycle(start), NOW)["weeks"]
+
+    assert len(weeks) == CYCLE_WEEKS
+    assert weeks[0] == {"week_number": 1, "start_date": start, "end_date": start + timedelta(weeks=1)}
+    assert weeks[-1]["end_date"] == start + timedelta(weeks=CYCLE_WEEKS)
+
+
+def test_counts_change_at_utc_midnight_not_at_the_start_time():
+    # Started late on the first day: the next morning is already day two
+    annotated = annotate_cycle(cycle(datetime(2026, 6, 14, 23, 0)), NOW)
+
+    assert annotated["days_remaining"] == CYCLE_WEEKS * 7 - 1
+
+
+def test_cycle_not_yet_started_is_in_week_one():
+    annotated = annotate_cycle(cycle(NOW + timedelta(days=3)), NOW)
+
+    assert annotated["current_week"] == 1
+    assert annotated["days_remaining"] == CYCLE_WEEKS * 7 + 3
+
+
+def test_overdue_active_cycle_stays_in_the_last_week():
+    annotated = annotate_cycle(cycle(NOW - timedelta(weeks=20)), NOW)
+
+    assert annotated["current_week"] == CYCLE_WEEKS
+    assert annotated["days_remaining"] == 0
+
+
+def test_completed_cycle_is_finished_whatever_the_dates():
+    annotated = annotate_cycle(cycle(NOW - timedelta(days=10), status="completed"), NOW)
+
+    assert annotated["current_week"] == CYCLE_WEEKS
+    assert annotated["days_remaining"] == 0
+
+
+def test_offset_dates_are_read_as_utc():
+    # 01:00 at +02:00 is 23:00 UTC the day before
+    start = datetime(2026, 6, 15, 1, 0, tzinfo=timezone(timedelta(hours=2)))
+
+    annotated = annotate_cycle(cycle(start), NOW)
+
+    assert annotated["days_remaining"] == CYCLE_WEEKS * 7 - 1
+
+
+def test_stored_derived_values_are_replaced():
+    stale = dict(cycle(NOW - timedelta(days=10)), current_week=7, days_remaining=1)
+
+    [annotated] = annotate_cycles([stale], NOW)
+
+    assert (annotated["current_week"], annotated["days_remaining"]) == (2, CYCLE_WEEKS * 7 - 10)
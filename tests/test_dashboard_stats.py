@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import dashboard_stats
+import server
+from database import db
+
+CYCLE = {"title": "Cycle", "description": "Twelve weeks", "law_of_attraction_statement": "It is done"}
+GOAL = {"title": "Goal", "description": "Outcome", "category": "health", "why_statement": "Why", "visualization_note": "Seen"}
+REFLECTION = {"progress_review": "Good", "neville_goddard_practice": "SATS", "challenges": "None", "insights": "Some"}
+
+
+def post(client, headers, path, body):
+    response = client.post(f"/api/{path}", headers=headers, json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def normalised(stats):
+    """Rebuilds only hold statuses that have documents; incremental updates leave zeros behind"""
+    return {
+        key: {status: count for status, count in value.items() if count} if key.endswith("_by_status") else value
+        for key, value in stats.items()
+        if key not in ("_id", "updated_at")
+    }
+
+
+def test_incremental_stats_match_a_rebuild_after_mixed_writes(client, auth_headers):
+    # The stats document is created by the first dashboard read and then only updated
+    assert client.get("/api/analytics/dashboard", headers=auth_headers).status_code == 200
+    cycle = post(client, auth_headers, "cycles", CYCLE)
+    other_cycle = post(client, auth_headers, "cycles", CYCLE)
+    overdue_start = (datetime.utcnow() - timedelta(weeks=13)).isoformat()
+    post(client, auth_headers, "cycles", dict(CYCLE, start_date=overdue_start))
+    goals = [post(client, auth_headers, "goals", dict(GOAL, cycle_id=cycle["id"]))["id"] for _ in range(4)]
+
+    post(client, auth_headers, f"goals/{goals[0]}/progress", {"progress": 40})
+    post(client, auth_headers, f"goals/{goals[1]}/progress", {"progress": 100})
+    client.put(f"/api/goals/{goals[2]}", headers=auth_headers, json={"status": "on_hold"})
+    post(client, auth_headers, "goals/bulk", {"updates": [
+        {"goal_id": goals[0], "progress": 100},
+        {"goal_id": goals[3], "status": "in_progress"},
+        {"goal_id": goals[2], "progress": 0, "status": "not_started"},
+        {"goal_id": "missing", "progress": 10},
+    ]})
+    post(client, auth_headers, "reflections", dict(REFLECTION, cycle_id=cycle["id"], week_number=1, mood_rating=8))
+    client.put(f"/api/cycles/{other_cycle['id']}", headers=auth_headers, json={"status": "paused"})
+    post(client, auth_headers, f"cycles/{cycle['id']}/complete", {"completion_notes": "Done"})
+    asyncio.run(server.complete_overdue_cycles_job())
+
+    async def load():
+        stored = await db.dashboard_stats.find_one({"user_id": auth_headers.user_id}, {"_id": 0})
+        rebuilt = await dashboard_stats.rebuild_dashboard_stats(db, auth_headers.user_id)
+        return stored, rebuilt
+
+    stored, rebuilt = asyncio.run(load())
+
+    assert normalised(stored) == normalised(rebuilt)
+    assert rebuilt["cycles_by_status"] == {"completed": 2, "paused": 1}
+    assert rebuilt["goals_by_status"] == {"completed": 2, "not_started": 1, "in_progress": 1}
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import timedelta
+
+import server
+
+
+def ticket_for(client, headers):
+    response = client.post("/api/events/ticket", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["ticket"]
+
+
+def open_stream(query_string: bytes):
+    """Run GET /api/events until the first body chunk, then disconnect; (status, first chunk)"""
+    async def scenario():
+        sent = []
+        first_chunk = asyncio.Event()
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await first_chunk.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "http.response.body" and (message.get("body") or not message.get("more_body")):
+                first_chunk.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": "/api/events", "raw_path": b"/api/events", "root_path": "", "query_string": query_string,
+            "headers": [], "client": ("test", 1), "server": ("test", 80),
+        }
+        await asyncio.wait_for(server.app(scope, receive, send), 5)
+        status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+        body = next(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+        return status, body
+
+    return asyncio.run(scenario())
+
+
+def test_ticket_opens_the_event_stream(client, auth_headers):
+    ticket = ticket_for(client, auth_headers)
+
+    status, body = open_stream(f"ticket={ticket}".encode())
+
+    assert status == 200
+    assert body.startswith(b"retry:")
+
+
+def test_access_token_is_not_accepted_in_the_url(client, auth_headers):
+    access_token = auth_headers["Authorization"].split()[1]
+
+    assert client.get("/api/events", params={"token": access_token}).status_code == 401
+    assert client.get("/api/events", params={"ticket": access_token}).status_code == 401
+
+
+def test_ticket_is_not_an_access_token(client, auth_headers):
+    ticket = ticket_for(client, auth_headers)
+
+    assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {ticket}"}).status_code == 401
+
+
+def test_expired_ticket_is_rejected(client, auth_headers):
+    expired = server.create_access_token(
+        {"sub": auth_headers.user_id, "scope": server.EVENT_TICKET_SCOPE}, expires_delta=timedelta(seconds=-1)
+    )
+
+    assert client.get("/api/events", params={"ticket": expired}).status_code == 401
+
+
+def test_ticket_requires_authentication(client):
+    # HTTPBearer answers a missing Authorization header with 403
+    assert client.post("/api/events/ticket").status_code == 403
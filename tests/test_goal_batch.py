@@ -0,0 +1,61 @@
+import asyncio
+
+import server
+
+CYCLE = {"title": "Cycle", "description": "Twelve weeks", "law_of_attraction_statement": "It is done"}
+GOAL = {"title": "Goal", "description": "Outcome", "category": "health", "why_statement": "Why", "visualization_note": "Seen"}
+
+
+def create_goal(client, headers):
+    cycle = client.post("/api/cycles", headers=headers, json=CYCLE).json()
+    return client.post("/api/goals", headers=headers, json=dict(GOAL, cycle_id=cycle["id"])).json()["id"]
+
+
+def outcomes(response):
+    assert response.status_code == 200, response.text
+    return [(result["goal_id"], result["success"], result["error"]) for result in response.json()["results"]]
+
+
+def test_mixed_batch_reports_each_item(client, auth_headers):
+    mine, also_mine = create_goal(client, auth_headers), create_goal(client, auth_headers)
+    other = client.post("/api/auth/register", json={"email": "other@example.com", "password": "password", "full_name": "O"}).json()
+    theirs = create_goal(client, {"Authorization": f"Bearer {other['access_token']}"})
+
+    response = client.post("/api/goals/bulk", headers=auth_headers, json={"updates": [
+        {"goal_id": mine, "progress": 50},
+        {"goal_id": "unknown", "progress": 50},
+        {"goal_id": theirs, "progress": 50},
+        {"goal_id": mine, "progress": 90},
+        {"goal_id": also_mine, "status": "on_hold"},
+    ]})
+
+    assert outcomes(response) == [
+        (mine, True, None),
+        ("unknown", False, "Goal not found"),
+        (theirs, False, "Goal not found"),
+        (mine, False, "Duplicate goal in batch"),
+        (also_mine, True, None),
+    ]
+    goals = {goal["id"]: goal for goal in client.get("/api/goals", headers=auth_headers).json()}
+    assert (goals[mine]["progress"], goals[also_mine]["status"]) == (50, "on_hold")
+    other_goals = client.get("/api/goals", headers={"Authorization": f"Bearer {other['access_token']}"}).json()
+    assert other_goals[0]["progress"] == 0
+
+
+def test_goal_deleted_during_the_batch_is_not_reported_as_updated(client, auth_headers, monkeypatch):
+    kept, deleted = create_goal(client, auth_headers), create_goal(client, auth_headers)
+    collection_cls = type(server.db.goals._collection)
+    bulk_write = collection_cls.bulk_write
+
+    async def delete_first(self, *args, **kwargs):
+        await server.db.goals.delete_one({"id": deleted})
+        return await bulk_write(self, *args, **kwargs)
+
+    monkeypatch.setattr(collection_cls, "bulk_write", delete_first)
+
+    response = client.post("/api/goals/bulk", headers=auth_headers, json={"updates": [
+        {"goal_id": kept, "progress": 10},
+        {"goal_id": deleted, "progress": 10},
+    ]})
+
+    assert outcomes(response) == [(kept, True, None), (deleted, False, "Goal not found")]
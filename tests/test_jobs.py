@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+import jobs
+from jobs import InMemoryBackend, JobRunner
+
+calls = []
+
+
+@jobs.register("test.record")
+async def record(key):
+    calls.append(key)
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def test_periodic_jobs_run_without_workers():
+    async def scenario():
+        runner = JobRunner(InMemoryBackend(), workers=0)
+        runner.start()
+        runner.every(0.01, "test.record", key="tick")
+        await asyncio.sleep(0.05)
+        await runner.drain(timeout=1)
+        return runner
+
+    runner = asyncio.run(scenario())
+
+    assert calls.count("tick") >= 2
+    assert not runner.scheduling
+
+
+class RecordingBackend(InMemoryBackend):
+    def __init__(self):
+        super().__init__()
+        self.delays = []
+
+    async def retry(self, job, delay):
+        self.delays.append(delay)
+        await super().retry(job, delay)
+
+
+def failing(times):
+    attempts = []
+
+    async def handler(key):
+        attempts.append(key)
+        if len(attempts) <= times:
+            raise RuntimeError("boom")
+
+    return attempts, handler
+
+
+def exhausted(name):
+    return sum(sample["value"] for sample in jobs.jobs_exhausted.snapshot() if sample["labels"]["job"] == name)
+
+
+def test_failed_job_is_retried_with_doubling_delay(monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_RETRY_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(jobs, "JOB_MAX_ATTEMPTS", 3)
+    attempts, handler = failing(times=2)
+    monkeypatch.setitem(jobs.registry, "test.flaky", handler)
+    backend = RecordingBackend()
+
+    async def scenario():
+        runner = JobRunner(backend, workers=1)
+        runner.start()
+        await runner.enqueue("test.flaky", key="k")
+        await asyncio.sleep(0.1)
+        await runner.drain(timeout=1)
+
+    asyncio.run(scenario())
+
+    assert len(attempts) == 3
+    assert backend.delays == [0.01, 0.02]
+    assert exhausted("test.flaky") == 0
+
+
+def test_job_failing_every_attempt_is_counted_as_exhausted(monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_RETRY_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(jobs, "JOB_MAX_ATTEMPTS", 2)
+    attempts, handler = failing(times=99)
+    monkeypatch.setitem(jobs.registry, "test.broken", handler)
+    before = exhausted("test.broken")
+
+    async def scenario():
+        runner = JobRunner(InMemoryBackend(), workers=1)
+        runner.start()
+        await runner.enqueue("test.broken", key="k")
+        await asyncio.sleep(0.1)
+        await runner.drain(timeout=1)
+
+    asyncio.run(scenario())
+
+    assert len(attempts) == 2
+    assert exhausted("test.broken") == before + 1
+
+
+def test_inline_job_failure_is_counted_as_exhausted(monkeypatch):
+    attempts, handler = failing(times=99)
+    monkeypatch.setitem(jobs.registry, "test.inline", handler)
+    before = exhausted("test.inline")
+
+    asyncio.run(JobRunner(InMemoryBackend(), workers=0).enqueue("test.inline", key="k"))
+
+    assert len(attempts) == 1
+    assert exhausted("test.inline") == before + 1
+
+
+def test_drain_runs_pending_retries_before_stopping(monkeypatch):
+    # Far longer than the test: only drain releasing the retry lets it run
+    monkeypatch.setattr(jobs, "JOB_RETRY_DELAY_SECONDS", 60)
+    attempts, handler = failing(times=1)
+    monkeypatch.setitem(jobs.registry, "test.flaky", handler)
+
+    async def scenario():
+        runner = JobRunner(InMemoryBackend(), workers=1)
+        runner.start()
+        await runner.enqueue("test.flaky", key="k")
+        await runner.enqueue("test.record", key="queued")
+        await asyncio.sleep(0.05)
+        await runner.drain(timeout=1)
+        return runner
+
+    runner = asyncio.run(scenario())
+
+    assert len(attempts) == 2
+    assert calls == ["queued"]
+    assert runner.stats()["queued"] == 0
+    assert not runner.accepting
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from pagination import decode_cursor, encode_cursor, keyset_filter
+
+SORT_FIELDS = ("created_at", "id")
+
+
+def test_cursor_round_trip():
+    doc = {"created_at": datetime(2026, 3, 1, 12, 30, 15, 250000), "id": "abc", "title": "ignored"}
+
+    assert decode_cursor(encode_cursor(doc, SORT_FIELDS), SORT_FIELDS) == [doc["created_at"], "abc"]
+
+
+def test_keyset_filter_matches_everything_after_the_cursor():
+    created_at = datetime(2026, 3, 1)
+    cursor = encode_cursor({"created_at": created_at, "id": "abc"}, SORT_FIELDS)
+
+    assert keyset_filter({"user_id": "u1"}, SORT_FIELDS, cursor) == {
+        "$and": [
+            {"user_id": "u1"},
+            {"$or": [{"created_at": {"$gt": created_at}}, {"created_at": created_at, "id": {"$gt": "abc"}}]},
+        ]
+    }
+
+
+def test_keyset_filter_without_cursor_is_unchanged():
+    assert keyset_filter({"user_id": "u1"}, SORT_FIELDS) == {"user_id": "u1"}
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 json",
+    # [{"$ne": null}, "abc"]: an operator smuggled in as a sort value
+    "W3siJG5lIjpudWxsfSwiYWJjIl0",
+    # [["abc"], "abc"]
+    "W1siYWJjIl0sImFiYyJd",
+    # ["abc"]: wrong number of sort values
+    "WyJhYmMiXQ",
+])
+def test_invalid_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor, SORT_FIELDS)
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import server
+import sync
+from database import db
+
+
+def register(client):
+    response = client.post("/api/auth/register", json={"email": "pat@example.com", "password": "password", "full_name": "Pat"})
+    return response.json()
+
+
+def snapshot_entry(goal_id, progress, date=None):
+    snapshot = server.GoalProgressSnapshot(date=date or datetime.utcnow(), progress=progress)
+    return {"goal_id": goal_id, "snapshot": snapshot.dict()}
+
+
+def stored_progress(goal_id):
+    async def load():
+        buckets = await db.goal_progress_history.find({"goal_id": goal_id}, {"_id": 0}).to_list(None)
+        return [snapshot["progress"] for bucket in buckets for snapshot in bucket["snapshots"]]
+    return asyncio.run(load())
+
+
+def test_repeated_job_stores_each_snapshot_once(client):
+    entries = [snapshot_entry("g1", 10), snapshot_entry("g1", 20)]
+
+    asyncio.run(server.write_progress_snapshots("u1", entries))
+    asyncio.run(server.write_progress_snapshots("u1", entries))
+
+    assert stored_progress("g1") == [10, 20]
+
+
+def test_retry_after_a_partial_write_across_full_bucket(client, monkeypatch):
+    monkeypatch.setattr(server, "PROGRESS_BUCKET_SIZE", 2)
+    entries = [snapshot_entry("g1", progress) for progress in (10, 20, 30)]
+
+    # The first attempt stored two snapshots, filling a bucket, before failing
+    asyncio.run(server.write_progress_snapshots("u1", entries[:2]))
+    asyncio.run(server.write_progress_snapshots("u1", entries))
+
+    assert stored_progress("g1") == [10, 20, 30]
+
+
+def test_sync_returns_snapshot_stored_after_the_checkpoint_even_if_dated_before(client):
+    tokens = register(client)
+    user_id = tokens["user"]["id"]
+    since = sync.encode_sync_token(datetime.utcnow() - timedelta(minutes=10))
+    # Reported an hour ago, stored only now by a delayed job
+    backdated = snapshot_entry("g1", 42, date=datetime.utcnow() - timedelta(hours=1))
+    asyncio.run(server.write_progress_snapshots(user_id, [backdated]))
+
+    response = client.get("/api/sync", params={"since": since}, headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+    assert response.status_code == 200
+    snapshots = response.json()["progress_snapshots"]
+    assert [(snapshot["goal_id"], snapshot["progress"]) for snapshot in snapshots] == [("g1", 42)]
@@ -0,0 +1,62 @@
+import asyncio
+
+import rate_limit
+from rate_limit import InMemoryStore, RateLimit, parse_limit
+
+LIMIT = RateLimit(capacity=2, period=10)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def take(store, key="ip:1.2.3.4"):
+    return asyncio.run(store.take(key, LIMIT))
+
+
+def test_parse_limit():
+    assert parse_limit("5/300") == RateLimit(5, 300.0)
+
+
+def test_bucket_allows_a_burst_up_to_capacity(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "monotonic", Clock())
+    store = InMemoryStore()
+
+    assert [take(store), take(store)] == [0.0, 0.0]
+    # One token refills every period / capacity seconds
+    assert take(store) == 5.0
+
+
+def test_bucket_refills_over_time(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    store = InMemoryStore()
+    take(store), take(store)
+
+    clock.now += 5
+    assert take(store) == 0.0
+    assert take(store) == 5.0
+
+
+def test_buckets_are_per_key(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "monotonic", Clock())
+    store = InMemoryStore()
+    take(store, "a"), take(store, "a")
+
+    assert take(store, "b") == 0.0
+
+
+def test_least_recently_used_keys_are_dropped(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "monotonic", Clock())
+    store = InMemoryStore(max_keys=2)
+    take(store, "a"), take(store, "a")
+    take(store, "b")
+    take(store, "c")
+
+    assert len(store) == 2
+    # "a" was evicted, so it starts again with a full bucket
+    assert take(store, "a") == 0.0
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from sync import decode_sync_token, encode_sync_token
+
+
+def test_sync_token_round_trip():
+    checkpoint = datetime(2026, 5, 4, 8, 15, 30, 123456)
+
+    assert decode_sync_token(encode_sync_token(checkpoint)) == checkpoint
+
+
+def test_sync_token_with_an_offset_decodes_to_naive_utc():
+    checkpoint = datetime(2026, 5, 4, 10, 15, tzinfo=timezone(timedelta(hours=2)))
+
+    decoded = decode_sync_token(encode_sync_token(checkpoint))
+
+    assert decoded == datetime(2026, 5, 4, 8, 15)
+    assert decoded.tzinfo is None
+
+
+@pytest.mark.parametrize("token", ["", "garbage", "eyJ4IjoiMjAyNi0wNS0wNCJ9"])
+def test_invalid_sync_token_is_a_bad_request(token):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_sync_token(token)
+    assert excinfo.value.status_code == 400
+
+
+def sync_body(client, headers, since):
+    response = client.get("/api/sync", params={"since": since}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.parametrize("fast_json", [False, True])
+def test_progress_snapshots_have_the_same_shape_in_both_serializers(client, monkeypatch, fast_json):
+    import asyncio
+
+    import server
+
+    monkeypatch.setattr(server, "FAST_JSON", fast_json)
+    tokens = client.post("/api/auth/register", json={"email": "kim@example.com", "password": "password", "full_name": "Kim"}).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    since = encode_sync_token(datetime.utcnow() - timedelta(minutes=1))
+    snapshot = server.GoalProgressSnapshot(date=datetime.utcnow(), progress=30)
+    asyncio.run(server.write_progress_snapshots(tokens["user"]["id"], [{"goal_id": "g1", "snapshot": snapshot.dict()}]))
+
+    [synced] = sync_body(client, headers, since)["progress_snapshots"]
+
+    assert set(synced) == {"id", "date", "progress", "notes", "goal_id"}
+    assert synced["id"] == snapshot.id